@@ -1,61 +1,68 @@
 import time
-import threading
-from collections import deque
+import _thread
 from logger import setup_logger
 
 logger = setup_logger()
 
 class RateLimiter:
+    """
+    Token-bucket rate limiter: on average at most max_calls calls per period
+
+    Unlike a sliding window, this is not a hard cap per window. A full bucket allows a burst of
+    max_calls calls at once, and tokens keep refilling at max_calls/period, so up to about
+    2 * max_calls calls can pass within a single period (a burst followed by a period of refill).
+    For an API with a strict per-window limit, pass max_calls at half that limit.
+    """
+
     def __init__(self, max_calls=60, period=60.0):
         self.max_calls = max_calls
         self.period = period
-        self.calls = deque()
-        self.lock = threading.Lock()
+
+        # Token bucket: holds up to max_calls tokens, refilled continuously at max_calls/period
+        self.capacity = float(max_calls)
+        self.refill_rate = max_calls / period
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = _thread.allocate_lock()
+
+    def _refill(self, now):
+        """Add tokens for the time elapsed since the last refill (caller must hold the lock)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
 
     def wait(self):
         with self.lock:
-            now = time.time()
-            
-            # Remove calls outside the current window
-            while self.calls and now - self.calls[0] >= self.period:
-                self.calls.popleft()
-            
-            # If we've hit the rate limit, wait
-            if len(self.calls) >= self.max_calls:
-                sleep_time = self.period - (now - self.calls[0])
-                if sleep_time > 0:
-                    logger.info(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
-                    time.sleep(sleep_time)
-            
-            # Record this call
-            self.calls.append(now)
+            self._refill(time.monotonic())
+
+            # Reserve a token for this call; a negative balance queues the caller
+            # behind earlier reservations
+            self.tokens -= 1
+            sleep_time = -self.tokens / self.refill_rate if self.tokens < 0 else 0
+
+        # Sleep outside the lock so other threads aren't blocked for the whole wait
+        if sleep_time > 0:
+            logger.info(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
+            time.sleep(sleep_time)
 
     def acquire(self):
         """Alias for wait() to maintain compatibility with existing code"""
         self.wait()
 
     def reset(self):
-        """Clear all recorded calls"""
+        """Refill the bucket to full capacity"""
         with self.lock:
-            self.calls.clear()
+            self.tokens = self.capacity
+            self.last_refill = time.monotonic()
             logger.info("Rate limiter reset")
 
     def get_remaining_calls(self):
-        """Get number of remaining calls in current window"""
+        """Get number of calls that can be made right now without waiting"""
         with self.lock:
-            now = time.time()
-            
-            # Remove calls outside the current window
-            while self.calls and now - self.calls[0] >= self.period:
-                self.calls.popleft()
-            
-            return max(0, self.max_calls - len(self.calls))
+            self._refill(time.monotonic())
+            return max(0, int(self.tokens))
 
     def get_reset_time(self):
-        """Get time until the rate limit window resets"""
+        """Get time until the bucket is back to full capacity"""
         with self.lock:
-            if not self.calls:
-                return 0
-            
-            now = time.time()
-            return max(0, self.period - (now - self.calls[0]))
\ No newline at end of file
+            self._refill(time.monotonic())
+            return max(0, (self.capacity - self.tokens) / self.refill_rate)
@@ -1,36 +1,147 @@
+import multiprocessing
+import os
+import re
+import tempfile
+import zipfile
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 from models import Database
 from signal_detector import SignalDetector
 from utils import (
     calculate_tp_sl_prices, 
-    check_tp_sl_hit, 
-    calculate_pnl,
-    calculate_pnl_percentage,
     parse_datetime,
     save_results_to_csv,
     calculate_win_rate,
     print_backtest_summary,
-    is_within_trading_hours
+    build_trading_minutes_mask,
+    TIMEFRAME_MINUTES
 )
 from config import ENABLE_TIMEOUT, TIMEOUT_HOURS, ENABLE_TIME_WINDOW, TRADE_START_TIME, TRADE_END_TIME, ENABLE_SINGLE_ORDER_MODE, TP_AMOUNT, SL_AMOUNT
+from config import ENABLE_CANDLE_CACHE, CANDLE_CACHE_DIR, SYMBOL
 from logger import setup_logger
 
 logger = setup_logger()
 
+# Initial capacity of the active order buffer (grows when full)
+ORDER_BUFFER_SIZE = 64
+
+# Signal type codes stored in the active order buffer
+SIGNAL_LONG = 0
+SIGNAL_SHORT = 1
+SIGNAL_CODES = {'LONG': SIGNAL_LONG, 'SHORT': SIGNAL_SHORT}
+
+# Price columns stored in the on-disk candle cache (timestamp is stored separately)
+CACHE_PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Timestamps are handled as int64 nanoseconds since epoch in the hot loop
+NS_PER_MINUTE = 60_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+
+def _resolve_first_hit(tp_mask, sl_mask, lo):
+    """
+    Pick the earliest TP or SL hit in a 1-minute window
+    
+    The first TP and first SL candles are located independently and the earlier one wins.
+    When both levels are hit on the same candle TP wins, matching check_tp_sl_hit() so that
+    backtests and live signals resolve ties the same way.
+    
+    Args:
+        tp_mask: np.ndarray - True where the candle reaches the take profit
+        sl_mask: np.ndarray - True where the candle reaches the stop loss
+        lo: int - Index of the window's first candle in the 1-minute arrays
+        
+    Returns:
+        tuple: (index, hit_type) where hit_type is 'TP', 'SL' or None
+    """
+    # argmax returns 0 for an all-False mask, so map "no hit" to the window length
+    n = len(tp_mask)
+    tp_idx = int(tp_mask.argmax())
+    sl_idx = int(sl_mask.argmax())
+    if not tp_mask[tp_idx]:
+        tp_idx = n
+    if not sl_mask[sl_idx]:
+        sl_idx = n
+    
+    first = min(tp_idx, sl_idx)
+    if first == n:
+        return -1, None
+    
+    return lo + first, 'TP' if tp_idx <= sl_idx else 'SL'
+
+def _scan_long(high, low, lo, hi, tp_price, sl_price):
+    """Find the first 1-minute candle in [lo, hi) hitting TP (above) or SL (below) of a LONG order"""
+    return _resolve_first_hit(high[lo:hi] >= tp_price, low[lo:hi] <= sl_price, lo)
+
+def _scan_short(high, low, lo, hi, tp_price, sl_price):
+    """Find the first 1-minute candle in [lo, hi) hitting TP (below) or SL (above) of a SHORT order"""
+    return _resolve_first_hit(low[lo:hi] <= tp_price, high[lo:hi] >= sl_price, lo)
+
+# TP/SL scan kernel for each signal type code
+_SCANNERS = (_scan_long, _scan_short)
+
+def _finalize_trade(entry_price, exit_price, is_long, tp_price):
+    """
+    Compute PnL figures for a closed trade in one call
+    
+    Same arithmetic as calculate_pnl() / calculate_pnl_percentage().
+    
+    Returns:
+        tuple: (pnl, pnl_percentage, reached_tp) where reached_tp tells whether the exit
+               price is at or beyond the take profit level
+    """
+    if is_long:
+        pnl = exit_price - entry_price
+        reached_tp = exit_price >= tp_price
+    else:
+        pnl = entry_price - exit_price
+        reached_tp = exit_price <= tp_price
+    
+    return pnl, (pnl / entry_price) * 100, reached_tp
+
+def _run_backtest_worker(timeframe, start_date, end_date):
+    """
+    Run one backtest in a worker process
+    
+    The Backtester (and its database connection) is created inside the worker so no
+    connection is shared across processes. Workers are spawned (see run_sweep), so they
+    start with a fresh engine and logger instead of forked copies of the parent's.
+    
+    Returns:
+        tuple: (timeframe, backtest results)
+    """
+    backtester = Backtester(timeframe=timeframe)
+    try:
+        return timeframe, backtester.run_backtest(start_date, end_date)
+    finally:
+        backtester.close()
+
 class Backtester:
     def __init__(self, timeframe='15m'):
         self.db = Database()
         self.signal_detector = SignalDetector()
-        self.active_orders = []  # Store active orders in memory
         self.completed_orders = []  # Store completed orders for results
         self.timeframe = timeframe
         
+        # Main timeframe bar length, used to find each bar's 1-minute window
+        self._tf_ns = self._get_timeframe_minutes(timeframe) * NS_PER_MINUTE
+        
+        # Active orders are kept column-wise in numpy arrays (see _reset_orders)
+        self._reset_orders()
+        
+        # Resolve backtest configuration once instead of re-reading it in the per-bar loop
+        self._timeout_ns = TIMEOUT_HOURS * NS_PER_HOUR if TIMEOUT_HOURS > 0 else 0
+        self._close_at_end = ENABLE_TIMEOUT
+        # Trading window as a minute-of-day lookup table (None = trade at any time)
+        self._trade_minutes = build_trading_minutes_mask(TRADE_START_TIME, TRADE_END_TIME) if ENABLE_TIME_WINDOW else None
+        self._single_order_mode = ENABLE_SINGLE_ORDER_MODE
+        
         # Log configuration
         config_info = []
-        if ENABLE_TIME_WINDOW:
+        if self._trade_minutes is not None:
             config_info.append(f"time window: {TRADE_START_TIME}-{TRADE_END_TIME}")
-        if ENABLE_SINGLE_ORDER_MODE:
+        if self._single_order_mode:
             config_info.append("single order mode")
         
         if config_info:
@@ -57,7 +168,7 @@ class Backtester:
             logger.info(f"Starting backtest from {start_dt} to {end_dt}")
             
             # Load historical data from database for specific timeframe (for signals)
-            df = self.db.load_candles(start_dt, end_dt, self.timeframe)
+            df = self._load_candles_cached(start_dt, end_dt, self.timeframe)
             
             if df.empty:
                 logger.error("No historical data found for backtest period")
@@ -71,7 +182,7 @@ class Backtester:
             logger.info("SuperTrend calculated for signal confidence scoring")
             
             # Load 1-minute data for precise TP/SL checking
-            df_1m = self.db.load_candles(start_dt, end_dt, '1m')
+            df_1m = self._load_candles_cached(start_dt, end_dt, '1m')
             
             if df_1m.empty:
                 logger.error("No 1-minute data found for TP/SL checking")
@@ -79,40 +190,51 @@ class Backtester:
             
             logger.info(f"Loaded {len(df_1m)} 1-minute candles for TP/SL precision")
             
+            # load_candles returns rows ORDER BY timestamp ASC; only sort if that ever isn't the case
+            if not df['timestamp'].is_monotonic_increasing:
+                df = df.sort_values('timestamp').reset_index(drop=True)
+            if not df_1m['timestamp'].is_monotonic_increasing:
+                df_1m = df_1m.sort_values('timestamp').reset_index(drop=True)
+            
+            # Columnar (SoA) view of the 1-minute data for vectorized TP/SL scanning
+            self._ts_1m = df_1m['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+            self._high_1m = df_1m['high'].to_numpy(dtype=np.float64)
+            self._low_1m = df_1m['low'].to_numpy(dtype=np.float64)
+            
             # Reset state
-            self.active_orders = []
+            self._reset_orders()
             self.completed_orders = []
             
-            # Sort data by timestamp ASC for chronological processing
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            df_1m = df_1m.sort_values('timestamp').reset_index(drop=True)
+            # Convert candles to dicts once instead of per-iteration iloc lookups
+            candles = df.to_dict('records')
+            ts_ns = df['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
             
             # Start backtesting loop from index 3 (need 3 lookback candles)
             current_index = 3
             
-            while current_index < len(df):
-                current_time = df.iloc[current_index]['timestamp']
-                current_candle = df.iloc[current_index].to_dict()
+            while current_index < len(candles):
+                current_candle = candles[current_index]
+                current_time = current_candle['timestamp']
                 
                 logger.debug(f"Processing candle at {current_time}")
                 
                 # Step 1: Look for new signals at this time BEFORE checking/closing orders
                 # Get the lookback candles (N1, N2, N3)
                 if current_index >= 3:
-                    n1 = df.iloc[current_index - 3].to_dict()  # lookback 3
-                    n2 = df.iloc[current_index - 2].to_dict()  # lookback 2  
-                    n3 = df.iloc[current_index - 1].to_dict()  # lookback 1
+                    n1 = candles[current_index - 3]  # lookback 3
+                    n2 = candles[current_index - 2]  # lookback 2  
+                    n3 = candles[current_index - 1]  # lookback 1
                     
                     signal = self.signal_detector.detect_signal(n1, n2, n3)
                     
                     if signal:
                         # Check single order mode first (if enabled)
-                        if ENABLE_SINGLE_ORDER_MODE and len(self.active_orders) > 0:
-                            logger.info(f"Signal ignored due to single order mode: {len(self.active_orders)} active order(s) at {current_time.strftime('%Y-%m-%d %H:%M')}")
+                        if self._single_order_mode and self._n_active > 0:
+                            logger.info(f"Signal ignored due to single order mode: {self._n_active} active order(s) at {current_time.strftime('%Y-%m-%d %H:%M')}")
                         else:
                             # Check if within trading time window (if enabled)
-                            if ENABLE_TIME_WINDOW:
-                                if is_within_trading_hours(current_time, TRADE_START_TIME, TRADE_END_TIME):
+                            if self._trade_minutes is not None:
+                                if self._trade_minutes[(int(ts_ns[current_index]) // NS_PER_MINUTE) % 1440]:
                                     self._place_order(signal, current_time)
                                 else:
                                     logger.debug(f"Signal ignored outside trading hours: {current_time.strftime('%H:%M')} (Trading window: {TRADE_START_TIME}-{TRADE_END_TIME})")
@@ -120,13 +242,15 @@ class Backtester:
                                 self._place_order(signal, current_time)
                 
                 # Step 2: Check existing orders for TP/SL hits and timeouts using 1-minute precision
-                self._check_active_orders_with_1m_precision(current_candle, df_1m)
+                # (most bars have no open orders, so skip the call entirely)
+                if self._n_active:
+                    self._check_active_orders_with_1m_precision(current_candle, int(ts_ns[current_index]))
                 
                 current_index += 1
             
             # Process any remaining active orders at the end (only if TIMEOUT enabled)
-            if ENABLE_TIMEOUT:
-                self._close_remaining_orders(df.iloc[-1].to_dict())
+            if self._close_at_end:
+                self._close_remaining_orders(candles[-1])
             
             logger.info(f"Backtest completed. Total trades: {len(self.completed_orders)}")
             
@@ -136,252 +260,313 @@ class Backtester:
             logger.error(f"Error during backtest: {e}")
             return []
 
-    def _check_active_orders_with_1m_precision(self, current_candle, df_1m):
+    def _load_candles_cached(self, start_dt, end_dt, timeframe):
+        """
+        Load candles from the database, or from the on-disk NPZ cache if ENABLE_CANDLE_CACHE is set
+        
+        Cache files are keyed by symbol, timeframe and date range. They are not refreshed
+        automatically - delete CANDLE_CACHE_DIR after re-crawling data for a cached range.
+        
+        Args:
+            start_dt: datetime - Start time
+            end_dt: datetime - End time
+            timeframe: str - Candle timeframe
+            
+        Returns:
+            DataFrame: Candles with timestamp and OHLCV columns
+        """
+        if not ENABLE_CANDLE_CACHE:
+            return self.db.load_candles(start_dt, end_dt, timeframe)
+        
+        symbol = re.sub(r'[^A-Za-z0-9]+', '', SYMBOL)
+        filename = f"{symbol}_{timeframe}_{start_dt:%Y%m%d%H%M%S}_{end_dt:%Y%m%d%H%M%S}.npz"
+        cache_path = os.path.join(CANDLE_CACHE_DIR, filename)
+        
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cached:
+                    df = pd.DataFrame({'timestamp': cached['timestamp']})
+                    for column in CACHE_PRICE_COLUMNS:
+                        df[column] = cached[column]
+                logger.info(f"Loaded {len(df)} {timeframe} candles from cache {cache_path}")
+                return df
+            except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+                logger.warning(f"Ignoring unreadable candle cache {cache_path}: {e}")
+        
+        df = self.db.load_candles(start_dt, end_dt, timeframe)
+        
+        if not df.empty:
+            try:
+                os.makedirs(CANDLE_CACHE_DIR, exist_ok=True)
+                # Write to a temp file and rename it into place, so sweep workers loading the same range
+                # never read a half-written cache file
+                fd, tmp_path = tempfile.mkstemp(dir=CANDLE_CACHE_DIR, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        np.savez(
+                            f,
+                            timestamp=df['timestamp'].to_numpy(dtype='datetime64[ns]'),
+                            **{column: df[column].to_numpy(dtype=np.float64) for column in CACHE_PRICE_COLUMNS}
+                        )
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                logger.info(f"Cached {len(df)} {timeframe} candles to {cache_path}")
+            except OSError as e:
+                logger.warning(f"Failed to write candle cache {cache_path}: {e}")
+        
+        return df
+
+    @classmethod
+    def run_sweep(cls, timeframes, start_date, end_date, max_workers=None):
+        """
+        Run independent backtests for several timeframes in parallel processes
+        
+        Args:
+            timeframes: list - Timeframes to backtest, e.g. ['15m', '30m', '1h']
+            start_date: str or datetime - Backtest start date
+            end_date: str or datetime - Backtest end date
+            max_workers: int - Number of worker processes (default: one per timeframe, up to CPU count)
+            
+        Returns:
+            dict: Backtest results keyed by timeframe
+        """
+        if not timeframes:
+            return {}
+        
+        if max_workers is None:
+            max_workers = min(len(timeframes), os.cpu_count() or 1)
+        
+        logger.info(f"Starting backtest sweep over {', '.join(timeframes)} with {max_workers} worker(s)")
+        
+        results = {}
+        # spawn, not fork: a forked child would inherit the parent's pooled DB sockets (models.get_engine)
+        # and a logger whose QueueListener thread doesn't exist in the child
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {
+                executor.submit(_run_backtest_worker, timeframe, start_date, end_date): timeframe
+                for timeframe in timeframes
+            }
+            
+            for future in as_completed(futures):
+                timeframe = futures[future]
+                try:
+                    _, results[timeframe] = future.result()
+                    logger.info(f"Sweep: {timeframe} backtest finished with {len(results[timeframe])} trades")
+                except Exception as e:
+                    logger.error(f"Sweep: {timeframe} backtest failed: {e}")
+                    results[timeframe] = []
+        
+        return results
+
+    def _check_active_orders_with_1m_precision(self, current_candle, current_ts):
         """
         Check active orders for TP/SL hits using 1-minute precision ONLY (no fallback)
         
+        Uses the columnar 1-minute arrays prepared by run_backtest().
+        
         Args:
             current_candle: dict - Current main timeframe candle data  
-            df_1m: DataFrame - 1-minute data for precise TP/SL checking
+            current_ts: int - Current candle timestamp in nanoseconds since epoch
         """
-        if not self.active_orders:
+        if not self._n_active:
             return
             
-        orders_to_remove = []
+        orders = self._orders
         current_time = current_candle['timestamp']
         
-        # Calculate the timeframe duration for determining 1m range
-        timeframe_minutes = self._get_timeframe_minutes(self.timeframe)
-        
-        for order in self.active_orders:
-            # Check for time-based timeout first (if enabled)
-            if TIMEOUT_HOURS > 0:
-                order_age_hours = (current_time - order['entry_time']).total_seconds() / 3600
-                if order_age_hours >= TIMEOUT_HOURS:
-                    # Order timed out
-                    exit_price = current_candle['close']
-                    pnl = calculate_pnl(order['entry_price'], exit_price, order['signal_type'])
-                    pnl_percentage = calculate_pnl_percentage(order['entry_price'], exit_price, order['signal_type'])
-                    
-                    # Determine if it would have been a win or loss based on exit price vs TP
-                    if order['signal_type'] == 'LONG':
-                        result = 'WIN' if exit_price >= order['tp_price'] else 'LOSS'
-                    else:  # SHORT
-                        result = 'WIN' if exit_price <= order['tp_price'] else 'LOSS'
-                    
-                    completed_order = {
-                        'entry_time': order['entry_time'],
-                        'exit_time': current_time,
-                        'signal_type': order['signal_type'],
-                        'condition': order['condition'],
-                        'entry_price': order['entry_price'],
-                        'exit_price': exit_price,
-                        'tp_price': order['tp_price'],
-                        'sl_price': order['sl_price'],
-                        'hit_type': 'TIMEOUT',
-                        'pnl': pnl,
-                        'pnl_percentage': pnl_percentage,
-                        'result': result,
-                        'duration_minutes': int((current_time - order['entry_time']).total_seconds() / 60),
-                        'confidence': order.get('confidence') or 'N/A'
-                    }
-                    
-                    self.completed_orders.append(completed_order)
-                    orders_to_remove.append(order)
-                    
-                    logger.info(f"TIMEOUT trade: {order['signal_type']} from {order['entry_time']} "
-                               f"timed out at {current_time} after {order_age_hours:.1f}h, PnL: ${pnl:.4f}")
-                    continue
+        # 1-minute index range of the current bar (current_time - timeframe, current_time],
+        # computed once for all orders
+        window_lo = int(np.searchsorted(self._ts_1m, current_ts - self._tf_ns, side='right'))
+        hi = int(np.searchsorted(self._ts_1m, current_ts, side='right'))
+        
+        # Order ages and timeouts for all active orders in one vectorized pass
+        live = self._active_slots()
+        ages_ns = current_ts - orders['entry_ts'][live]
+        if self._timeout_ns:
+            expired = ages_ns >= self._timeout_ns
+        else:
+            expired = np.zeros(len(live), dtype=bool)
+        
+        # Walk orders in placement order so completed trades keep their original order
+        for slot, order_age_ns, is_expired in zip(live.tolist(), ages_ns.tolist(), expired.tolist()):
+            order = self._order_meta[slot]
+            
+            if is_expired:
+                # Order timed out
+                completed_order = self._complete_order(
+                    order, current_time, current_candle['close'], 'TIMEOUT', order_age_ns // NS_PER_MINUTE
+                )
+                self._close_order(slot)
+                
+                logger.info(f"TIMEOUT trade: {order['signal_type']} from {order['entry_time']} "
+                           f"timed out at {current_time} after {order_age_ns / NS_PER_HOUR:.1f}h, "
+                           f"PnL: ${completed_order['pnl']:.4f}")
+                continue
             
             # Check for TP/SL hits using 1-minute precision ONLY
             # Skip orders placed at current time (they should be checked in next iteration)
-            if order['entry_time'] >= current_time:
+            if order_age_ns <= 0:
                 continue  # Skip orders placed at or after current time
             
-            # Get 1-minute candles between previous timeframe candle and current candle
-            start_1m = current_time - timedelta(minutes=timeframe_minutes)
-            end_1m = current_time
+            # Only scan 1-minute candles of the current bar that this order hasn't seen yet;
+            # the cursor starts right after entry_time (no look-ahead bias)
+            lo = max(int(orders['cursor_1m'][slot]), window_lo)
+            orders['cursor_1m'][slot] = hi
             
-            # Filter 1-minute candles for this period (no look-ahead bias)
-            mask_1m = (df_1m['timestamp'] > start_1m) & (df_1m['timestamp'] <= end_1m)
-            period_1m_candles = df_1m[mask_1m]
+            if lo >= hi:
+                continue
             
-            hit_found = False
+            hit_idx, hit_type = _SCANNERS[orders['signal_type'][slot]](
+                self._high_1m, self._low_1m, lo, hi,
+                orders['tp_price'][slot], orders['sl_price'][slot]
+            )
             
-            # Check each 1-minute candle in this period chronologically (NO fallback)
-            for _, candle_1m in period_1m_candles.iterrows():
-                # Only process 1m candles that occur after the order was placed
-                if candle_1m['timestamp'] <= order['entry_time']:
-                    continue
-                    
-                hit_type, exit_price = check_tp_sl_hit(
-                    candle_1m.to_dict(), 
-                    order['tp_price'], 
-                    order['sl_price'], 
-                    order['signal_type']
+            if hit_type:
+                # Order hit TP or SL on this 1-minute candle
+                exit_price = order['tp_price'] if hit_type == 'TP' else order['sl_price']
+                
+                # Use the precise 1-minute timestamp for exit_time
+                exit_ts = int(self._ts_1m[hit_idx])
+                exit_time_precise = pd.Timestamp(exit_ts)
+                
+                completed_order = self._complete_order(
+                    order, exit_time_precise, exit_price, hit_type,
+                    (exit_ts - int(orders['entry_ts'][slot])) // NS_PER_MINUTE
                 )
+                self._close_order(slot)
                 
-                if hit_type:
-                    # Order hit TP or SL on this 1-minute candle
-                    pnl = calculate_pnl(order['entry_price'], exit_price, order['signal_type'])
-                    pnl_percentage = calculate_pnl_percentage(order['entry_price'], exit_price, order['signal_type'])
-                    result = 'WIN' if hit_type == 'TP' else 'LOSS'
-                    
-                    # Use the precise 1-minute timestamp for exit_time
-                    exit_time_precise = candle_1m['timestamp']
-                    
-                    # Create completed order record
-                    completed_order = {
-                        'entry_time': order['entry_time'],
-                        'exit_time': exit_time_precise,
-                        'signal_type': order['signal_type'],
-                        'condition': order['condition'],
-                        'entry_price': order['entry_price'],
-                        'exit_price': exit_price,
-                        'tp_price': order['tp_price'],
-                        'sl_price': order['sl_price'],
-                        'hit_type': hit_type,
-                        'pnl': pnl,
-                        'pnl_percentage': pnl_percentage,
-                        'result': result,
-                        'duration_minutes': int((exit_time_precise - order['entry_time']).total_seconds() / 60),
-                        'confidence': order.get('confidence') or 'N/A'
-                    }
-                    
-                    self.completed_orders.append(completed_order)
-                    orders_to_remove.append(order)
-                    
-                    logger.info(f"{result} trade: {order['signal_type']} from {order['entry_time']} "
-                               f"hit {hit_type} at {exit_time_precise} (1m precision), PnL: ${pnl:.4f}")
-                    
-                    hit_found = True
-                    break  # Exit 1m loop once we find a hit
+                logger.info(f"{completed_order['result']} trade: {order['signal_type']} from {order['entry_time']} "
+                           f"hit {hit_type} at {exit_time_precise} (1m precision), PnL: ${completed_order['pnl']:.4f}")
             
             # Continue to next order (no fallback to main timeframe)
-        
-        # Remove completed orders from active list
-        for order in orders_to_remove:
-            self.active_orders.remove(order)
 
-    def _get_timeframe_minutes(self, timeframe_str):
+    def _complete_order(self, order, exit_time, exit_price, hit_type, duration_minutes):
         """
-        Convert timeframe string to minutes
+        Record a closed order as a completed trade
         
         Args:
-            timeframe_str: str - Timeframe like '1m', '5m', '15m', '30m', '1h', '4h', '1d'
+            order: dict - Order being closed
+            exit_time: datetime - Exit time
+            exit_price: float - Exit price
+            hit_type: str - 'TP', 'SL' or 'TIMEOUT'
+            duration_minutes: int - Time the order was open
             
         Returns:
-            int: Number of minutes
+            dict: Completed order record (also appended to completed_orders)
         """
-        timeframe_minutes = {
-            '1m': 1,
-            '5m': 5,
-            '15m': 15,
-            '30m': 30,
-            '1h': 60,
-            '4h': 240,
-            '1d': 1440
-        }
+        signal_type = order['signal_type']
+        entry_price = order['entry_price']
+        pnl, pnl_percentage, reached_tp = _finalize_trade(
+            entry_price, exit_price, signal_type == 'LONG', order['tp_price']
+        )
         
-        minutes = timeframe_minutes.get(timeframe_str.lower())
-        if minutes is None:
-            logger.warning(f"Unknown timeframe {timeframe_str}, using 15 minutes")
-            return 15
+        if hit_type == 'TIMEOUT':
+            # Determine if it would have been a win or loss based on exit price vs TP
+            result = 'WIN' if reached_tp else 'LOSS'
+        else:
+            result = 'WIN' if hit_type == 'TP' else 'LOSS'
         
-        return minutes
+        completed_order = {
+            'entry_time': order['entry_time'],
+            'exit_time': exit_time,
+            'signal_type': signal_type,
+            'condition': order['condition'],
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'tp_price': order['tp_price'],
+            'sl_price': order['sl_price'],
+            'hit_type': hit_type,
+            'pnl': pnl,
+            'pnl_percentage': pnl_percentage,
+            'result': result,
+            'duration_minutes': duration_minutes,
+            'confidence': order.get('confidence') or 'N/A'
+        }
+        
+        self.completed_orders.append(completed_order)
+        return completed_order
 
-    def _check_active_orders(self, current_candle):
+    def _reset_orders(self, capacity=ORDER_BUFFER_SIZE):
         """
-        DEPRECATED: Original method kept for backward compatibility
-        Check active orders against current candle for TP/SL hits and timeouts
+        Reset the active order buffer
+        
+        Numeric order fields used by the per-bar scans live in parallel numpy arrays indexed
+        by slot; the full order dict (condition, signal details, ...) is kept in _order_meta.
+        Slots are handed out in placement order, so iterating live slots preserves the
+        order in which trades were opened.
         
         Args:
-            current_candle: dict - Current candle data
+            capacity: int - Initial number of slots
         """
-        orders_to_remove = []
-        current_time = current_candle['timestamp']
+        self._orders = {
+            'entry_ts': np.empty(capacity, dtype=np.int64),
+            'entry_price': np.empty(capacity, dtype=np.float64),
+            'tp_price': np.empty(capacity, dtype=np.float64),
+            'sl_price': np.empty(capacity, dtype=np.float64),
+            'signal_type': np.empty(capacity, dtype=np.int8),
+            'cursor_1m': np.empty(capacity, dtype=np.int64),
+            'alive': np.zeros(capacity, dtype=bool)
+        }
+        self._order_meta = [None] * capacity
+        self._n_slots = 0  # Slots used so far (live or closed)
+        self._n_active = 0
+
+    def _allocate_order_slot(self):
+        """
+        Get the next free slot, compacting or growing the buffer when it is full
         
-        for order in self.active_orders:
-            # Check for time-based timeout first (if enabled)
-            if TIMEOUT_HOURS > 0:
-                order_age_hours = (current_time - order['entry_time']).total_seconds() / 3600
-                if order_age_hours >= TIMEOUT_HOURS:
-                    # Order timed out
-                    exit_price = current_candle['close']
-                    pnl = calculate_pnl(order['entry_price'], exit_price, order['signal_type'])
-                    pnl_percentage = calculate_pnl_percentage(order['entry_price'], exit_price, order['signal_type'])
-                    
-                    # Determine if it would have been a win or loss based on exit price vs TP
-                    if order['signal_type'] == 'LONG':
-                        result = 'WIN' if exit_price >= order['tp_price'] else 'LOSS'
-                    else:  # SHORT
-                        result = 'WIN' if exit_price <= order['tp_price'] else 'LOSS'
-                    
-                    completed_order = {
-                        'entry_time': order['entry_time'],
-                        'exit_time': current_time,
-                        'signal_type': order['signal_type'],
-                        'condition': order['condition'],
-                        'entry_price': order['entry_price'],
-                        'exit_price': exit_price,
-                        'tp_price': order['tp_price'],
-                        'sl_price': order['sl_price'],
-                        'hit_type': 'TIMEOUT',
-                        'pnl': pnl,
-                        'pnl_percentage': pnl_percentage,
-                        'result': result,
-                        'duration_minutes': int((current_time - order['entry_time']).total_seconds() / 60),
-                        'confidence': order.get('confidence') or 'N/A'
-                    }
-                    
-                    self.completed_orders.append(completed_order)
-                    orders_to_remove.append(order)
-                    
-                    logger.info(f"TIMEOUT trade: {order['signal_type']} from {order['entry_time']} "
-                               f"timed out at {current_time} after {order_age_hours:.1f}h, PnL: ${pnl:.4f}")
-                    continue
-            
-            # Check for TP/SL hits
-            hit_type, exit_price = check_tp_sl_hit(
-                current_candle, 
-                order['tp_price'], 
-                order['sl_price'], 
-                order['signal_type']
-            )
+        Returns:
+            int: Slot index
+        """
+        capacity = len(self._order_meta)
+        
+        if self._n_slots == capacity:
+            live = self._active_slots()
+            new_capacity = capacity * 2 if len(live) > capacity // 2 else capacity
+            
+            # Move live orders to the front, keeping their placement order
+            compacted = {}
+            for name, column in self._orders.items():
+                compacted[name] = np.zeros(new_capacity, dtype=column.dtype) if name == 'alive' else np.empty(new_capacity, dtype=column.dtype)
+                compacted[name][:len(live)] = column[live]
+            
+            meta = [self._order_meta[slot] for slot in live]
+            self._orders = compacted
+            self._order_meta = meta + [None] * (new_capacity - len(meta))
+            self._n_slots = len(live)
+        
+        slot = self._n_slots
+        self._n_slots += 1
+        return slot
+
+    def _active_slots(self):
+        """Get slot indices of active orders in placement order"""
+        return np.flatnonzero(self._orders['alive'][:self._n_slots])
+
+    def _close_order(self, slot):
+        """Remove an order from the active buffer"""
+        self._orders['alive'][slot] = False
+        self._order_meta[slot] = None
+        self._n_active -= 1
+
+    def _get_timeframe_minutes(self, timeframe_str):
+        """
+        Convert timeframe string to minutes
+        
+        Args:
+            timeframe_str: str - Timeframe like '1m', '5m', '15m', '30m', '1h', '4h', '1d'
             
-            if hit_type:
-                # Order hit TP or SL
-                pnl = calculate_pnl(order['entry_price'], exit_price, order['signal_type'])
-                pnl_percentage = calculate_pnl_percentage(order['entry_price'], exit_price, order['signal_type'])
-                result = 'WIN' if hit_type == 'TP' else 'LOSS'
-                
-                # Create completed order record
-                completed_order = {
-                    'entry_time': order['entry_time'],
-                    'exit_time': current_time,
-                    'signal_type': order['signal_type'],
-                    'condition': order['condition'],
-                    'entry_price': order['entry_price'],
-                    'exit_price': exit_price,
-                    'tp_price': order['tp_price'],
-                    'sl_price': order['sl_price'],
-                    'hit_type': hit_type,
-                    'pnl': pnl,
-                    'pnl_percentage': pnl_percentage,
-                    'result': result,
-                    'duration_minutes': int((current_time - order['entry_time']).total_seconds() / 60),
-                    'confidence': order.get('confidence') or 'N/A'
-                }
-                
-                self.completed_orders.append(completed_order)
-                orders_to_remove.append(order)
-                
-                logger.info(f"{result} trade: {order['signal_type']} from {order['entry_time']} "
-                           f"hit {hit_type} at {current_time}, PnL: ${pnl:.4f}")
+        Returns:
+            int: Number of minutes
+        """
+        minutes = TIMEFRAME_MINUTES.get(timeframe_str.lower())
+        if minutes is None:
+            logger.warning(f"Unknown timeframe {timeframe_str}, using 15 minutes")
+            return 15
         
-        # Remove completed orders from active list
-        for order in orders_to_remove:
-            self.active_orders.remove(order)
+        return minutes
 
     def _place_order(self, signal, current_time):
         """
@@ -398,9 +583,15 @@ class Backtester:
         # Calculate TP and SL prices
         tp_price, sl_price = calculate_tp_sl_prices(entry_price, signal_type)
         
+        entry_ts = pd.Timestamp(current_time).value
+        
+        # First 1-minute candle after entry, used as the order's scan cursor
+        entry_idx_1m = int(np.searchsorted(self._ts_1m, entry_ts, side='right'))
+        
         # Create order
         order = {
             'entry_time': current_time,
+            'entry_idx_1m': entry_idx_1m,
             'signal_type': signal_type,
             'condition': condition,
             'entry_price': entry_price,
@@ -410,7 +601,17 @@ class Backtester:
             'confidence': signal.get('confidence') or 'N/A'
         }
         
-        self.active_orders.append(order)
+        slot = self._allocate_order_slot()
+        orders = self._orders
+        orders['entry_ts'][slot] = entry_ts
+        orders['entry_price'][slot] = entry_price
+        orders['tp_price'][slot] = tp_price
+        orders['sl_price'][slot] = sl_price
+        orders['signal_type'][slot] = SIGNAL_CODES.get(signal_type, SIGNAL_SHORT)
+        orders['cursor_1m'][slot] = entry_idx_1m
+        orders['alive'][slot] = True
+        self._order_meta[slot] = order
+        self._n_active += 1
         
         logger.info(f"Placed {signal_type} order at {current_time}: "
                    f"Entry=${entry_price:.4f}, TP=${tp_price:.4f}, SL=${sl_price:.4f}")
@@ -422,43 +623,24 @@ class Backtester:
         Args:
             last_candle: dict - Last candle data
         """
-        for order in self.active_orders:
-            exit_price = last_candle['close']
-            exit_time = last_candle['timestamp']
-            pnl = calculate_pnl(order['entry_price'], exit_price, order['signal_type'])
-            pnl_percentage = calculate_pnl_percentage(order['entry_price'], exit_price, order['signal_type'])
-            
-            # Determine if it would have been a win or loss based on exit price
-            if order['signal_type'] == 'LONG':
-                result = 'WIN' if exit_price >= order['tp_price'] else 'LOSS'
-            else:  # SHORT
-                result = 'WIN' if exit_price <= order['tp_price'] else 'LOSS'
-            
-            completed_order = {
-                'entry_time': order['entry_time'],
-                'exit_time': exit_time,
-                'signal_type': order['signal_type'],
-                'condition': order['condition'],
-                'entry_price': order['entry_price'],
-                'exit_price': exit_price,
-                'tp_price': order['tp_price'],
-                'sl_price': order['sl_price'],
-                'hit_type': 'TIMEOUT',
-                'pnl': pnl,
-                'pnl_percentage': pnl_percentage,
-                'result': result,
-                'duration_minutes': int((exit_time - order['entry_time']).total_seconds() / 60),
-                'confidence': order.get('confidence', 'N/A')
-            }
-            
-            self.completed_orders.append(completed_order)
+        exit_price = last_candle['close']
+        exit_time = last_candle['timestamp']
+        exit_ts = pd.Timestamp(exit_time).value
+        
+        for slot in self._active_slots():
+            order = self._order_meta[slot]
+            completed_order = self._complete_order(
+                order, exit_time, exit_price, 'TIMEOUT',
+                (exit_ts - int(self._orders['entry_ts'][slot])) // NS_PER_MINUTE
+            )
             
             logger.info(f"Closed remaining {order['signal_type']} order at backtest end: "
-                       f"Entry=${order['entry_price']:.4f}, Exit=${exit_price:.4f}, PnL=${pnl:.4f}")
+                       f"Entry=${order['entry_price']:.4f}, Exit=${exit_price:.4f}, PnL=${completed_order['pnl']:.4f}")
         
-        self.active_orders.clear()
+        self._reset_orders()
 
-    def export_results(self, results, filename_prefix="backtest_results"):
+    @staticmethod
+    def export_results(results, filename_prefix="backtest_results"):
         """
         Export backtest results to CSV
         
@@ -477,7 +659,8 @@ class Backtester:
         logger.info(f"Results exported to {filepath}")
         return filepath
 
-    def analyze_results(self, results):
+    @staticmethod
+    def analyze_results(results):
         """
         Analyze and print backtest results
         
@@ -493,28 +676,35 @@ class Backtester:
         
         stats = calculate_win_rate(results)
         
-        # Additional analysis
-        long_trades = [r for r in results if r['signal_type'] == 'LONG']
-        short_trades = [r for r in results if r['signal_type'] == 'SHORT']
+        # Additional analysis in a single vectorized pass over the result columns
+        df = pd.DataFrame(results, columns=['signal_type', 'condition', 'result', 'duration_minutes'])
+        wins = (df['result'] == 'WIN').to_numpy()
+        
+        def _count_and_wins(mask):
+            total = int(mask.sum())
+            won = int((mask & wins).sum())
+            return total, won, (won / total) * 100 if total else 0
         
-        engulfing_trades = [r for r in results if r['condition'] == 'ENGULFING']
-        inside_bar_trades = [r for r in results if r['condition'] == 'INSIDE_BAR']
+        long_trades, long_wins, long_win_rate = _count_and_wins((df['signal_type'] == 'LONG').to_numpy())
+        short_trades, short_wins, short_win_rate = _count_and_wins((df['signal_type'] == 'SHORT').to_numpy())
+        engulfing_trades, engulfing_wins, engulfing_win_rate = _count_and_wins((df['condition'] == 'ENGULFING').to_numpy())
+        inside_bar_trades, inside_bar_wins, inside_bar_win_rate = _count_and_wins((df['condition'] == 'INSIDE_BAR').to_numpy())
         
         detailed_stats = {
             **stats,
-            'long_trades': len(long_trades),
-            'short_trades': len(short_trades),
-            'long_wins': sum(1 for r in long_trades if r['result'] == 'WIN'),
-            'short_wins': sum(1 for r in short_trades if r['result'] == 'WIN'),
-            'long_win_rate': (sum(1 for r in long_trades if r['result'] == 'WIN') / len(long_trades)) * 100 if long_trades else 0,
-            'short_win_rate': (sum(1 for r in short_trades if r['result'] == 'WIN') / len(short_trades)) * 100 if short_trades else 0,
-            'engulfing_trades': len(engulfing_trades),
-            'inside_bar_trades': len(inside_bar_trades),
-            'engulfing_wins': sum(1 for r in engulfing_trades if r['result'] == 'WIN'),
-            'inside_bar_wins': sum(1 for r in inside_bar_trades if r['result'] == 'WIN'),
-            'engulfing_win_rate': (sum(1 for r in engulfing_trades if r['result'] == 'WIN') / len(engulfing_trades)) * 100 if engulfing_trades else 0,
-            'inside_bar_win_rate': (sum(1 for r in inside_bar_trades if r['result'] == 'WIN') / len(inside_bar_trades)) * 100 if inside_bar_trades else 0,
-            'avg_duration_minutes': sum(r['duration_minutes'] for r in results) / len(results) if results else 0
+            'long_trades': long_trades,
+            'short_trades': short_trades,
+            'long_wins': long_wins,
+            'short_wins': short_wins,
+            'long_win_rate': long_win_rate,
+            'short_win_rate': short_win_rate,
+            'engulfing_trades': engulfing_trades,
+            'inside_bar_trades': inside_bar_trades,
+            'engulfing_wins': engulfing_wins,
+            'inside_bar_wins': inside_bar_wins,
+            'engulfing_win_rate': engulfing_win_rate,
+            'inside_bar_win_rate': inside_bar_win_rate,
+            'avg_duration_minutes': sum(df['duration_minutes'].tolist()) / len(results)
         }
         
         # Print detailed analysis
@@ -530,7 +720,7 @@ class Backtester:
 
     def get_active_orders_count(self):
         """Get count of currently active orders"""
-        return len(self.active_orders)
+        return self._n_active
 
     def close(self):
         """Close database connection"""
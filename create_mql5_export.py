@@ -3,34 +3,50 @@
 Tạo MQL5 script để export data từ MT5
 """
 
-def create_mql5_script_by_daterange(symbol="XAUUSD", timeframe="PERIOD_M15", date_from="2025.01.01", date_to="2025.09.01", output_path="xauusd_export.csv"):
-    """Tạo MQL5 script"""
-    
-    mql5_script = f'''//+------------------------------------------------------------------+
+import re
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+# Date input format YYYY.MM.DD, compiled once
+_DATE_RE = re.compile(r'^\d{4}\.\d{2}\.\d{2}$')
+
+# Timeframe mapping (user input -> MQL5 ENUM_TIMEFRAMES)
+_TIMEFRAMES = {
+    "M1": "PERIOD_M1",
+    "M5": "PERIOD_M5",
+    "M15": "PERIOD_M15",
+    "M30": "PERIOD_M30",
+    "H1": "PERIOD_H1",
+    "H4": "PERIOD_H4",
+    "D1": "PERIOD_D1"
+}
+
+# Shared MQL5 script skeleton; ${...} slots below are filled per export mode,
+# the remaining placeholders (symbol, timeframe, ...) per call
+_COMMON_HEADER = Template('''//+------------------------------------------------------------------+
 //|                                         XAUDataExport.mq5       |
-//|                                Export {symbol} data by date range |
+//|                                Export ${symbol} data by ${mode_title} |
 //+------------------------------------------------------------------+
 
 #property script_show_inputs
 
-input string InpSymbol = "{symbol}";                    // Symbol to export
-input ENUM_TIMEFRAMES InpTimeframe = {timeframe};      // Timeframe
-input string InpDateFrom = "{date_from}";              // Start date (YYYY.MM.DD)
-input string InpDateTo = "{date_to}";                  // End date (YYYY.MM.DD)
-input string InpFileName = "{output_path}";            // Output filename
+input string InpSymbol = "${symbol}";                    // Symbol to export
+input ENUM_TIMEFRAMES InpTimeframe = ${timeframe};      // Timeframe
+${inputs}input string InpFileName = "${output_path}";            // Output filename
 
 //+------------------------------------------------------------------+
 //| Convert date string to datetime                                  |
 //+------------------------------------------------------------------+
 datetime StringToDateTime(string date_str)
-{{
+{
     // Parse "YYYY.MM.DD" format
     string parts[];
     if(StringSplit(date_str, '.', parts) != 3)
-    {{
+    {
         Print("Error: Invalid date format. Expected YYYY.MM.DD, got: ", date_str);
         return 0;
-    }}
+    }
     
     int year = (int)StringToInteger(parts[0]);
     int month = (int)StringToInteger(parts[1]);
@@ -38,145 +54,96 @@ datetime StringToDateTime(string date_str)
     
     // Validate date components
     if(year < 2000 || year > 2030 || month < 1 || month > 12 || day < 1 || day > 31)
-    {{
+    {
         Print("Error: Invalid date values in: ", date_str);
         return 0;
-    }}
+    }
     
-    // Create MqlDateTime structure
+    // Create MqlDateTime structure${time_comment}
     MqlDateTime dt;
     dt.year = year;
     dt.mon = month;
     dt.day = day;
-    dt.hour = 0;
-    dt.min = 0;
-    dt.sec = 0;
-    
+${time_of_day}    
     return StructToTime(dt);
-}}
-
+}
+${helpers}
 //+------------------------------------------------------------------+
 //| Script program start function                                    |
 //+------------------------------------------------------------------+
 void OnStart()
-{{
-    Print("=== STARTING MT5 DATA EXPORT BY DATE RANGE ===");
+{
+    Print("=== STARTING MT5 DATA EXPORT BY ${banner} ===");
     Print("Symbol: ", InpSymbol);
     Print("Timeframe: ", EnumToString(InpTimeframe));
-    Print("Date From: ", InpDateFrom);
-    Print("Date To: ", InpDateTo);
-    Print("Output filename: ", InpFileName);
+${input_prints}    Print("Output filename: ", InpFileName);
     Print("Files directory: ", TerminalInfoString(TERMINAL_DATA_PATH), "\\\\MQL5\\\\Files\\\\");
     
-    // Convert date strings to datetime
-    datetime date_from = StringToDateTime(InpDateFrom);
-    datetime date_to = StringToDateTime(InpDateTo);
-    
-    if(date_from == 0 || date_to == 0)
-    {{
-        Print("ERROR: Failed to parse dates");
-        return;
-    }}
-    
-    if(date_from >= date_to)
-    {{
-        Print("ERROR: Start date must be before end date");
-        return;
-    }}
-    
-    Print("Parsed dates successfully:");
-    Print("From: ", TimeToString(date_from));
-    Print("To: ", TimeToString(date_to));
-    
+${parse_inputs}    
     // Check if symbol exists
     if(!SymbolSelect(InpSymbol, true))
-    {{
+    {
         Print("ERROR: Symbol ", InpSymbol, " not found or not selected");
         Print("Available symbols in Market Watch:");
         for(int s = 0; s < SymbolsTotal(true); s++)
-        {{
+        {
             string sym = SymbolName(s, true);
             if(StringFind(sym, "XAU") >= 0 || StringFind(sym, "GOLD") >= 0)
-            {{
+            {
                 Print("  Found gold symbol: ", sym);
-            }}
-        }}
+            }
+        }
         return;
-    }}
+    }
     
     Print("Symbol ", InpSymbol, " selected successfully");
     
     // Open file for writing
+    // FILE_BIN|FILE_ANSI writes single-byte ANSI text; scripts generated before used FILE_CSV, which
+    // writes UTF-16LE. import_csv_data.py reads both encodings
     Print("Attempting to create file: ", InpFileName);
-    int handle = FileOpen(InpFileName, FILE_WRITE|FILE_CSV);
+    int handle = FileOpen(InpFileName, FILE_WRITE|FILE_BIN|FILE_ANSI);
     if(handle == INVALID_HANDLE)
-    {{
+    {
         Print("ERROR: Failed to create file: ", InpFileName);
         Print("Error code: ", GetLastError());
         
         // Try simple filename
         string simple_name = "data.csv";
         Print("Trying simple filename: ", simple_name);
-        handle = FileOpen(simple_name, FILE_WRITE|FILE_CSV);
+        handle = FileOpen(simple_name, FILE_WRITE|FILE_BIN|FILE_ANSI);
         if(handle == INVALID_HANDLE)
-        {{
+        {
             Print("ERROR: All attempts failed. Error code: ", GetLastError());
             return;
-        }}
+        }
         else
-        {{
+        {
             Print("SUCCESS: Created file with simple name: ", simple_name);
-        }}
-    }}
+        }
+    }
     else
-    {{
+    {
         Print("SUCCESS: File created: ", InpFileName);
-    }}
+    }
     
-    // Write CSV header
-    FileWrite(handle, "timestamp", "open", "high", "low", "close", "volume");
+    // Write CSV header (tab-separated, CRLF - same layout FileWrite produced for FILE_CSV)
+    FileWriteString(handle, "timestamp\\topen\\thigh\\tlow\\tclose\\tvolume\\r\\n");
     Print("CSV header written");
     
-    // Get historical data by date range
-    Print("Getting historical data from ", TimeToString(date_from), " to ", TimeToString(date_to));
-    MqlRates rates[];
-    int copied = CopyRates(InpSymbol, InpTimeframe, date_from, date_to, rates);
-    
-    if(copied <= 0)
-    {{
-        Print("Error: Failed to get rates for ", InpSymbol, " in date range");
-        Print("Error code: ", GetLastError());
-        Print("Trying alternative method with larger range...");
-        
-        // Alternative: get more data and filter
-        int estimated_bars = (int)((date_to - date_from) / PeriodSeconds(InpTimeframe)) + 1000;
-        if(estimated_bars > 100000) estimated_bars = 100000;
-        
-        copied = CopyRates(InpSymbol, InpTimeframe, 0, estimated_bars, rates);
-        if(copied <= 0)
-        {{
-            Print("Error: Alternative method also failed. Error code: ", GetLastError());
-            FileClose(handle);
-            return;
-        }}
-        
-        Print("Got ", copied, " bars with alternative method, will filter by date");
-    }}
-    else
-    {{
-        Print("Retrieved ", copied, " bars for ", InpSymbol, " in specified date range");
-    }}
-    
-    // Write data to CSV (filter by date if needed)
+''')
+
+_COMMON_WRITER_LOOP = Template('''    // Write data to CSV${write_note}
+    // Rows are collected in a string buffer and flushed every 4096 rows
     int written_count = 0;
-    for(int i = 0; i < copied; i++)
-    {{
+    int digits = _Digits;
+    string csv_buffer = "";
+    datetime first_time = 0, last_time = 0;
+    double last_close = 0;
+    for(int i = lo; i < hi; i++)
+    {
         datetime bar_time = rates[i].time;
         
-        // Skip bars outside our date range
-        if(bar_time < date_from || bar_time > date_to)
-            continue;
-        
         // Convert datetime to time structure
         MqlDateTime dt;
         TimeToStruct(bar_time, dt);
@@ -190,17 +157,32 @@ void OnStart()
                                       dt.min,
                                       dt.sec);
         
-        // Write row to CSV
-        FileWrite(handle,
-                 timestamp,
-                 DoubleToString(rates[i].open, _Digits),
-                 DoubleToString(rates[i].high, _Digits),
-                 DoubleToString(rates[i].low, _Digits),
-                 DoubleToString(rates[i].close, _Digits),
-                 IntegerToString(rates[i].tick_volume));
+        // Append row to the CSV buffer
+        csv_buffer += StringFormat("%s\\t%.*f\\t%.*f\\t%.*f\\t%.*f\\t%I64d\\r\\n",
+                                   timestamp,
+                                   digits, rates[i].open,
+                                   digits, rates[i].high,
+                                   digits, rates[i].low,
+                                   digits, rates[i].close,
+                                   rates[i].tick_volume);
         
         written_count++;
-    }}
+        
+        // Track first/last written records for the summary
+        if(first_time == 0) first_time = bar_time;
+        last_time = bar_time;
+        last_close = rates[i].close;
+        
+        if(written_count % 4096 == 0)
+        {
+            FileWriteString(handle, csv_buffer);
+            csv_buffer = "";
+        }
+    }
+    
+    // Flush remaining rows
+    if(StringLen(csv_buffer) > 0)
+        FileWriteString(handle, csv_buffer);
     
     FileClose(handle);
     
@@ -211,172 +193,110 @@ void OnStart()
     Print("Records written: ", written_count);
     Print("Symbol: ", InpSymbol);
     Print("Timeframe: ", EnumToString(InpTimeframe));
-    Print("Date range: ", TimeToString(date_from), " to ", TimeToString(date_to));
-    
-    if(written_count > 0)
-    {{
-        // Find first and last written records
-        datetime first_time = 0, last_time = 0;
-        double last_close = 0;
-        
-        for(int i = 0; i < copied; i++)
-        {{
-            datetime bar_time = rates[i].time;
-            if(bar_time >= date_from && bar_time <= date_to)
-            {{
-                if(first_time == 0) first_time = bar_time;
-                last_time = bar_time;
-                last_close = rates[i].close;
-            }}
-        }}
-        
-        Print("First record: ", TimeToString(first_time));
-        Print("Last record: ", TimeToString(last_time));
-        Print("Latest close: ", DoubleToString(last_close, _Digits));
-    }}
-}}'''
-
-    return mql5_script
+''')
 
-def create_mql5_script_by_bars(symbol="XAUUSD", timeframe="PERIOD_M15", bars=5000, start_date="2025.09.01", output_path="xauusd_export.csv"):
-    """Tạo MQL5 script lấy data theo số lượng bars từ start_date lùi về quá khứ"""
-    
-    mql5_script = f'''//+------------------------------------------------------------------+
-//|                                         XAUDataExport.mq5       |
-//|                                Export {symbol} data by bars count |
+_RANGE_HELPERS = '''
 //+------------------------------------------------------------------+
-
-#property script_show_inputs
-
-input string InpSymbol = "{symbol}";                    // Symbol to export
-input ENUM_TIMEFRAMES InpTimeframe = {timeframe};      // Timeframe
-input int InpBars = {bars};                            // Number of bars
-input string InpStartDate = "{start_date}";            // Start date (YYYY.MM.DD) - will go backward from this date
-input string InpFileName = "{output_path}";            // Output filename
-
+//| First index in r[0..n) whose time is >= t (r sorted by time)     |
 //+------------------------------------------------------------------+
-//| Convert date string to datetime                                  |
-//+------------------------------------------------------------------+
-datetime StringToDateTime(string date_str)
-{{
-    // Parse "YYYY.MM.DD" format
-    string parts[];
-    if(StringSplit(date_str, '.', parts) != 3)
-    {{
-        Print("Error: Invalid date format. Expected YYYY.MM.DD, got: ", date_str);
-        return 0;
-    }}
-    
-    int year = (int)StringToInteger(parts[0]);
-    int month = (int)StringToInteger(parts[1]);
-    int day = (int)StringToInteger(parts[2]);
+int LowerBound(const MqlRates &r[], int n, datetime t)
+{
+    int lo = 0, hi = n;
+    while(lo < hi)
+    {
+        int mid = (lo + hi) / 2;
+        if(r[mid].time < t)
+            lo = mid + 1;
+        else
+            hi = mid;
+    }
+    return lo;
+}
+'''
+
+_RANGE_PARSE_INPUTS = '''    // Convert date strings to datetime
+    datetime date_from = StringToDateTime(InpDateFrom);
+    datetime date_to = StringToDateTime(InpDateTo);
     
-    // Validate date components
-    if(year < 2000 || year > 2030 || month < 1 || month > 12 || day < 1 || day > 31)
-    {{
-        Print("Error: Invalid date values in: ", date_str);
-        return 0;
-    }}
+    if(date_from == 0 || date_to == 0)
+    {
+        Print("ERROR: Failed to parse dates");
+        return;
+    }
     
-    // Create MqlDateTime structure for end of day (23:59:59)
-    MqlDateTime dt;
-    dt.year = year;
-    dt.mon = month;
-    dt.day = day;
-    dt.hour = 23;
-    dt.min = 59;
-    dt.sec = 59;
+    if(date_from >= date_to)
+    {
+        Print("ERROR: Start date must be before end date");
+        return;
+    }
     
-    return StructToTime(dt);
-}}
+    Print("Parsed dates successfully:");
+    Print("From: ", TimeToString(date_from));
+    Print("To: ", TimeToString(date_to));
+'''
 
-//+------------------------------------------------------------------+
-//| Script program start function                                    |
-//+------------------------------------------------------------------+
-void OnStart()
-{{
-    Print("=== STARTING MT5 DATA EXPORT BY BARS COUNT ===");
-    Print("Symbol: ", InpSymbol);
-    Print("Timeframe: ", EnumToString(InpTimeframe));
-    Print("Bars: ", InpBars);
-    Print("Start Date: ", InpStartDate, " (going backward from this date)");
-    Print("Output filename: ", InpFileName);
-    Print("Files directory: ", TerminalInfoString(TERMINAL_DATA_PATH), "\\\\MQL5\\\\Files\\\\");
-    
-    // Validate inputs
+_BARS_PARSE_INPUTS = '''    // Validate inputs
     if(InpBars <= 0)
-    {{
+    {
         Print("ERROR: Invalid number of bars");
         return;
-    }}
+    }
     
     // Convert start date string to datetime
     datetime start_time = StringToDateTime(InpStartDate);
     if(start_time == 0)
-    {{
+    {
         Print("ERROR: Failed to parse start date");
         return;
-    }}
+    }
     
     Print("Parsed start date: ", TimeToString(start_time));
     Print("Will get ", InpBars, " bars going backward from this date");
+'''
+
+_RANGE_QUERY_BLOCK = '''    // Get historical data by date range
+    Print("Getting historical data from ", TimeToString(date_from), " to ", TimeToString(date_to));
+    MqlRates rates[];
+    int copied = CopyRates(InpSymbol, InpTimeframe, date_from, date_to, rates);
     
-    // Check if symbol exists
-    if(!SymbolSelect(InpSymbol, true))
-    {{
-        Print("ERROR: Symbol ", InpSymbol, " not found or not selected");
-        Print("Available symbols in Market Watch:");
-        for(int s = 0; s < SymbolsTotal(true); s++)
-        {{
-            string sym = SymbolName(s, true);
-            if(StringFind(sym, "XAU") >= 0 || StringFind(sym, "GOLD") >= 0)
-            {{
-                Print("  Found gold symbol: ", sym);
-            }}
-        }}
-        return;
-    }}
-    
-    Print("Symbol ", InpSymbol, " selected successfully");
-    
-    // Open file for writing
-    Print("Attempting to create file: ", InpFileName);
-    int handle = FileOpen(InpFileName, FILE_WRITE|FILE_CSV);
-    if(handle == INVALID_HANDLE)
-    {{
-        Print("ERROR: Failed to create file: ", InpFileName);
+    if(copied <= 0)
+    {
+        Print("Error: Failed to get rates for ", InpSymbol, " in date range");
         Print("Error code: ", GetLastError());
+        Print("Trying alternative method with larger range...");
         
-        // Try simple filename
-        string simple_name = "data.csv";
-        Print("Trying simple filename: ", simple_name);
-        handle = FileOpen(simple_name, FILE_WRITE|FILE_CSV);
-        if(handle == INVALID_HANDLE)
-        {{
-            Print("ERROR: All attempts failed. Error code: ", GetLastError());
+        // Alternative: get more data and filter
+        int estimated_bars = (int)((date_to - date_from) / PeriodSeconds(InpTimeframe)) + 1000;
+        if(estimated_bars > 100000) estimated_bars = 100000;
+        
+        copied = CopyRates(InpSymbol, InpTimeframe, 0, estimated_bars, rates);
+        if(copied <= 0)
+        {
+            Print("Error: Alternative method also failed. Error code: ", GetLastError());
+            FileClose(handle);
             return;
-        }}
-        else
-        {{
-            Print("SUCCESS: Created file with simple name: ", simple_name);
-        }}
-    }}
+        }
+        
+        Print("Got ", copied, " bars with alternative method, will filter by date");
+    }
     else
-    {{
-        Print("SUCCESS: File created: ", InpFileName);
-    }}
+    {
+        Print("Retrieved ", copied, " bars for ", InpSymbol, " in specified date range");
+    }
     
-    // Write CSV header
-    FileWrite(handle, "timestamp", "open", "high", "low", "close", "volume");
-    Print("CSV header written");
+    // rates[] is sorted by time: locate the [date_from, date_to] slice once
+    int lo = LowerBound(rates, copied, date_from);
+    int hi = LowerBound(rates, copied, date_to + 1);
     
-    // Get historical data by bars count from start_time
+'''
+
+_BARS_QUERY_BLOCK = '''    // Get historical data by bars count from start_time
     Print("Getting ", InpBars, " bars from ", TimeToString(start_time), " going backward...");
     MqlRates rates[];
     int copied = CopyRates(InpSymbol, InpTimeframe, start_time, InpBars, rates);
     
     if(copied <= 0)
-    {{
+    {
         Print("Error: Failed to get rates for ", InpSymbol);
         Print("Error code: ", GetLastError());
         Print("Trying alternative method...");
@@ -384,71 +304,123 @@ void OnStart()
         // Alternative: use CopyRates from position 0
         copied = CopyRates(InpSymbol, InpTimeframe, 0, InpBars, rates);
         if(copied <= 0)
-        {{
+        {
             Print("Error: Alternative method also failed. Error code: ", GetLastError());
             FileClose(handle);
             return;
-        }}
+        }
         
         Print("Got ", copied, " bars with alternative method");
-    }}
+    }
     else
-    {{
+    {
         Print("Retrieved ", copied, " bars for ", InpSymbol);
-    }}
-    
-    // Write data to CSV
-    int written_count = 0;
-    for(int i = 0; i < copied; i++)
-    {{
-        datetime bar_time = rates[i].time;
-        
-        // Convert datetime to time structure
-        MqlDateTime dt;
-        TimeToStruct(bar_time, dt);
-        
-        // Format timestamp as YYYY-MM-DD HH:MM:SS
-        string timestamp = StringFormat("%04d-%02d-%02d %02d:%02d:%02d",
-                                      dt.year,
-                                      dt.mon,
-                                      dt.day,
-                                      dt.hour,
-                                      dt.min,
-                                      dt.sec);
-        
-        // Write row to CSV
-        FileWrite(handle,
-                 timestamp,
-                 DoubleToString(rates[i].open, _Digits),
-                 DoubleToString(rates[i].high, _Digits),
-                 DoubleToString(rates[i].low, _Digits),
-                 DoubleToString(rates[i].close, _Digits),
-                 IntegerToString(rates[i].tick_volume));
-        
-        written_count++;
-    }}
+    }
     
-    FileClose(handle);
+    int lo = 0, hi = copied;
     
-    // Print summary
-    Print("Export completed successfully!");
-    Print("File: ", InpFileName);
-    Print("Total bars processed: ", copied);
-    Print("Records written: ", written_count);
-    Print("Symbol: ", InpSymbol);
-    Print("Timeframe: ", EnumToString(InpTimeframe));
-    Print("Start date: ", TimeToString(start_time));
+'''
+
+_RANGE_SUMMARY = '''    Print("Date range: ", TimeToString(date_from), " to ", TimeToString(date_to));
+'''
+
+_BARS_SUMMARY = '''    Print("Start date: ", TimeToString(start_time));
     Print("Bars requested: ", InpBars);
-    
+'''
+
+_COMMON_FOOTER = '''    
     if(written_count > 0)
-    {{
-        Print("First record: ", TimeToString(rates[0].time));
-        Print("Last record: ", TimeToString(rates[copied-1].time));
-        Print("Latest close: ", DoubleToString(rates[copied-1].close, _Digits));
-    }}
-}}'''
+    {
+        Print("First record: ", TimeToString(first_time));
+        Print("Last record: ", TimeToString(last_time));
+        Print("Latest close: ", DoubleToString(last_close, digits));
+    }
+}'''
+
+_MODE_BLOCKS = {
+    "range": {
+        "mode_title": "date range",
+        "inputs": '''input string InpDateFrom = "${date_from}";              // Start date (YYYY.MM.DD)
+input string InpDateTo = "${date_to}";                  // End date (YYYY.MM.DD)
+''',
+        "time_comment": "",
+        "time_of_day": '''    dt.hour = 0;
+    dt.min = 0;
+    dt.sec = 0;
+''',
+        "banner": "DATE RANGE",
+        "input_prints": '''    Print("Date From: ", InpDateFrom);
+    Print("Date To: ", InpDateTo);
+''',
+        "parse_inputs": _RANGE_PARSE_INPUTS,
+        "write_note": " (only bars inside the date range)",
+        "helpers": _RANGE_HELPERS,
+        "summary": _RANGE_SUMMARY,
+    },
+    "bars": {
+        "mode_title": "bars count",
+        "inputs": '''input int InpBars = ${bars};                            // Number of bars
+input string InpStartDate = "${start_date}";            // Start date (YYYY.MM.DD) - will go backward from this date
+''',
+        "time_comment": " for end of day (23:59:59)",
+        "time_of_day": '''    dt.hour = 23;
+    dt.min = 59;
+    dt.sec = 59;
+''',
+        "banner": "BARS COUNT",
+        "input_prints": '''    Print("Bars: ", InpBars);
+    Print("Start Date: ", InpStartDate, " (going backward from this date)");
+''',
+        "parse_inputs": _BARS_PARSE_INPUTS,
+        "write_note": "",
+        "helpers": "",
+        "summary": _BARS_SUMMARY,
+    },
+}
 
-    return mql5_script
+def _build_query_block(mode):
+    """Trả về đoạn CopyRates (kèm fallback) cho mode 'range' hoặc 'bars'"""
+    return _RANGE_QUERY_BLOCK if mode == "range" else _BARS_QUERY_BLOCK
+
+def _assemble_template(mode):
+    """Ghép skeleton chung với các block riêng của mode thành một Template"""
+    blocks = _MODE_BLOCKS[mode]
+    return Template(_COMMON_HEADER.safe_substitute(blocks)
+                    + _build_query_block(mode)
+                    + _COMMON_WRITER_LOOP.safe_substitute(blocks)
+                    + blocks["summary"]
+                    + _COMMON_FOOTER)
+
+# Per-mode templates, assembled once at import
+_TEMPLATES = {mode: _assemble_template(mode) for mode in _MODE_BLOCKS}
+
+def _build(mode, **params):
+    """Render MQL5 script cho mode 'range' hoặc 'bars'"""
+    return _TEMPLATES[mode].substitute(params)
+
+@lru_cache(maxsize=128)
+def create_mql5_script_by_daterange(symbol="XAUUSD", timeframe="PERIOD_M15", date_from="2025.01.01", date_to="2025.09.01", output_path="xauusd_export.csv"):
+    """Tạo MQL5 script"""
+    return _build(
+        "range",
+        symbol=symbol,
+        timeframe=timeframe,
+        date_from=date_from,
+        date_to=date_to,
+        output_path=output_path
+    )
+
+@lru_cache(maxsize=128)
+def create_mql5_script_by_bars(symbol="XAUUSD", timeframe="PERIOD_M15", bars=5000, start_date="2025.09.01", output_path="xauusd_export.csv"):
+    """Tạo MQL5 script lấy data theo số lượng bars từ start_date lùi về quá khứ"""
+    return _build(
+        "bars",
+        symbol=symbol,
+        timeframe=timeframe,
+        bars=bars,
+        start_date=start_date,
+        output_path=output_path
+    )
 
 def main():
     """Tạo MQL5 script với user input"""
@@ -467,31 +439,19 @@ def main():
             break
         print("❌ Invalid option. Please choose 1 or 2.")
     
-    # Timeframe mapping
-    timeframes = {
-        "M1": "PERIOD_M1",
-        "M5": "PERIOD_M5", 
-        "M15": "PERIOD_M15",
-        "M30": "PERIOD_M30",
-        "H1": "PERIOD_H1",
-        "H4": "PERIOD_H4",
-        "D1": "PERIOD_D1"
-    }
-    
     try:
         # Get common inputs
         symbol = input("📊 Symbol (default: XAUUSD): ").strip() or "XAUUSD"
         
         print("⏰ Available timeframes:")
-        for key, value in timeframes.items():
+        for key, value in _TIMEFRAMES.items():
             print(f"   {key} = {value}")
         tf_input = input("⏰ Timeframe (M1/M5/M15/M30/H1/H4/D1, default: M15): ").strip().upper() or "M15"
         
-        if tf_input not in timeframes:
+        timeframe = _TIMEFRAMES.get(tf_input)
+        if timeframe is None:
             print(f"❌ Invalid timeframe. Using M15")
-            tf_input = "M15"
-        
-        timeframe = timeframes[tf_input]
+            tf_input, timeframe = "M15", _TIMEFRAMES["M15"]
         
         if option == "1":
             # Option 1: Export by bars count
@@ -512,10 +472,7 @@ def main():
             start_date_input = input("📅 Start date - will go backward from 23:59 of this date (YYYY.MM.DD, default: 2025.09.01): ").strip() or "2025.09.01"
             
             # Validate date format
-            import re
-            date_pattern = r'^\d{4}\.\d{2}\.\d{2}$'
-            
-            if not re.match(date_pattern, start_date_input):
+            if not _DATE_RE.match(start_date_input):
                 print("❌ Invalid start date format. Using 2025.09.01")
                 start_date_input = "2025.09.01"
             
@@ -536,14 +493,11 @@ def main():
             date_to_input = input("📅 End date (YYYY.MM.DD, default: 2025.09.01): ").strip() or "2025.09.01"
             
             # Validate date format
-            import re
-            date_pattern = r'^\d{4}\.\d{2}\.\d{2}$'
-            
-            if not re.match(date_pattern, date_from_input):
+            if not _DATE_RE.match(date_from_input):
                 print("❌ Invalid start date format. Using 2025.01.01")
                 date_from_input = "2025.01.01"
                 
-            if not re.match(date_pattern, date_to_input):
+            if not _DATE_RE.match(date_to_input):
                 print("❌ Invalid end date format. Using 2025.09.01")
                 date_to_input = "2025.09.01"
             
@@ -555,8 +509,7 @@ def main():
             script_filename = f"{symbol}Export_{tf_input}_range.mq5"
         
         # Save file
-        with open(script_filename, 'w', encoding='utf-8') as f:
-            f.write(script_content)
+        Path(script_filename).write_text(script_content, encoding='utf-8')
         
         print()
         print("=" * 50)
@@ -607,8 +560,7 @@ def main():
         
         script_content = create_mql5_script_by_daterange(symbol, timeframe, date_from, date_to, output_filename)
         
-        with open("XAUDataExport.mq5", 'w', encoding='utf-8') as f:
-            f.write(script_content)
+        Path("XAUDataExport.mq5").write_text(script_content, encoding='utf-8')
         
         print("✅ Default script created: XAUDataExport.mq5")
 
@@ -1,13 +1,44 @@
 from datetime import datetime, timedelta
+import queue
+import threading
+import numpy as np
 import pandas as pd
 import sys
 from models import Database
 # TIMEFRAME import removed - now using instance timeframe
 from logger import setup_logger
-from utils import parse_datetime, get_utc3_now, get_utc_now
+from utils import parse_datetime, get_utc3_now, get_utc_now, TIMEFRAME_MINUTES
+from config import GAP_MERGE_INTERVALS, CRAWL_CHUNK_DAYS
 
 logger = setup_logger()
 
+NS_PER_MINUTE = 60_000_000_000
+
+def _find_gaps(ts_ns, expected_ns):
+    """
+    Find missing-candle ranges in a sorted int64 nanosecond timestamp array
+    
+    Args:
+        ts_ns: np.ndarray - Sorted candle timestamps (int64 ns)
+        expected_ns: int - Candle interval in ns
+    
+    Returns:
+        tuple: (starts_ns, ends_ns, duration_minutes) arrays - first/last missing candle time
+               and the missing minutes of each gap
+    """
+    deltas = np.diff(ts_ns)
+    
+    # Common case on healthy data: no spacing exceeds one interval, skip the gap extraction
+    if deltas.size == 0 or deltas.max() <= expected_ns:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    
+    gap_idx = np.flatnonzero(deltas > expected_ns)
+    
+    return (ts_ns[gap_idx] + expected_ns,
+            ts_ns[gap_idx + 1] - expected_ns,
+            (deltas[gap_idx] - expected_ns) // NS_PER_MINUTE)
+
 # Check if MetaTrader5 is available (Windows only)
 try:
     import MetaTrader5 as mt5
@@ -17,6 +48,17 @@ except ImportError:
     MT5_AVAILABLE = False
     logger.warning("MetaTrader5 library not available - this will only work on Windows")
 
+# Timeframe string -> MT5 timeframe constant
+_MT5_TF_MAP = {
+    '1m': mt5.TIMEFRAME_M1,
+    '5m': mt5.TIMEFRAME_M5,
+    '15m': mt5.TIMEFRAME_M15,
+    '30m': mt5.TIMEFRAME_M30,
+    '1h': mt5.TIMEFRAME_H1,
+    '4h': mt5.TIMEFRAME_H4,
+    '1d': mt5.TIMEFRAME_D1
+} if MT5_AVAILABLE else {}
+
 class DataCrawler:
     def __init__(self, timeframe='15m'):
         if not MT5_AVAILABLE:
@@ -29,23 +71,14 @@ class DataCrawler:
         self.symbol = None
         self.mt5_initialized = False
         self.timeframe = timeframe
-        logger.info(f"Data crawler initialized for {timeframe} timeframe")
+        self._timeframe_minutes = self._get_timeframe_minutes(timeframe)
+        logger.info("Data crawler initialized for %s timeframe", timeframe)
 
     def _get_mt5_timeframe(self, timeframe_str):
         """Convert timeframe string to MT5 timeframe constant"""
-        timeframe_mapping = {
-            '1m': mt5.TIMEFRAME_M1,
-            '5m': mt5.TIMEFRAME_M5,
-            '15m': mt5.TIMEFRAME_M15,
-            '30m': mt5.TIMEFRAME_M30,
-            '1h': mt5.TIMEFRAME_H1,
-            '4h': mt5.TIMEFRAME_H4,
-            '1d': mt5.TIMEFRAME_D1
-        }
-        
-        mt5_timeframe = timeframe_mapping.get(timeframe_str.lower())
+        mt5_timeframe = _MT5_TF_MAP.get(timeframe_str.lower())
         if mt5_timeframe is None:
-            logger.warning(f"Unsupported timeframe {timeframe_str}, using 15m")
+            logger.warning("Unsupported timeframe %s, using 15m", timeframe_str)
             return mt5.TIMEFRAME_M15
         
         return mt5_timeframe
@@ -82,26 +115,16 @@ class DataCrawler:
             microsecond=0
         )
         
-        logger.info(f"Current time: {current_time.strftime('%H:%M:%S')} UTC+3")
-        logger.info(f"Last closed {timeframe} candle: {last_closed_time.strftime('%H:%M:%S')} UTC+3")
+        logger.info("Current time: %s UTC+3", current_time.strftime('%H:%M:%S'))
+        logger.info("Last closed %s candle: %s UTC+3", timeframe, last_closed_time.strftime('%H:%M:%S'))
         
         return last_closed_time
 
     def _get_timeframe_minutes(self, timeframe_str):
         """Convert timeframe string to minutes"""
-        timeframe_minutes = {
-            '1m': 1,
-            '5m': 5,
-            '15m': 15,
-            '30m': 30,
-            '1h': 60,
-            '4h': 240,
-            '1d': 1440
-        }
-        
-        minutes = timeframe_minutes.get(timeframe_str.lower())
+        minutes = TIMEFRAME_MINUTES.get(timeframe_str.lower())
         if minutes is None:
-            logger.warning(f"Unknown timeframe {timeframe_str}, using 15 minutes")
+            logger.warning("Unknown timeframe %s, using 15 minutes", timeframe_str)
             return 15
         
         return minutes
@@ -109,12 +132,16 @@ class DataCrawler:
     def _initialize_mt5(self):
         """Initialize MT5 connection and find gold symbol"""
         if self.mt5_initialized:
-            return True
+            # A dropped terminal doesn't raise (copy_rates_range just returns None), so check it's still there
+            if mt5.terminal_info() is not None:
+                return True
+            logger.warning("MT5 terminal connection lost, reconnecting")
+            self._shutdown_mt5()
             
         try:
             # Initialize MT5
             if not mt5.initialize():
-                logger.error(f"Failed to initialize MT5: {mt5.last_error()}")
+                logger.error("Failed to initialize MT5: %s", mt5.last_error())
                 return False
             
             logger.info("✓ Connected to MetaTrader5")
@@ -125,7 +152,7 @@ class DataCrawler:
             for gold_symbol in gold_symbols:
                 if mt5.symbol_select(gold_symbol, True):
                     self.symbol = gold_symbol
-                    logger.info(f"✓ Found gold symbol: {self.symbol}")
+                    logger.info("✓ Found gold symbol: %s", self.symbol)
                     self.mt5_initialized = True
                     return True
             
@@ -134,13 +161,13 @@ class DataCrawler:
             symbols = mt5.symbols_get()
             if symbols:
                 for s in symbols[:20]:  # Show first 20 symbols
-                    logger.info(f"  {s.name}")
+                    logger.info("  %s", s.name)
             
             mt5.shutdown()
             return False
             
         except Exception as e:
-            logger.error(f"Error initializing MT5: {e}")
+            logger.error("Error initializing MT5: %s", e)
             return False
 
     def _shutdown_mt5(self):
@@ -150,27 +177,23 @@ class DataCrawler:
             self.mt5_initialized = False
             logger.info("✓ Disconnected from MT5")
 
-    def _get_mt5_data(self, start_date, end_date):
-        """Get data from MT5"""
+    def _get_mt5_data(self, start_dt, end_dt):
+        """
+        Get data from MT5
+        
+        Args:
+            start_dt: datetime - Start time (callers parse string inputs once at their entry point)
+            end_dt: datetime - End time
+        """
         try:
-            # Convert to timezone-aware datetime if needed
-            if isinstance(start_date, str):
-                start_dt = parse_datetime(start_date)
-            else:
-                start_dt = start_date
-                
-            if isinstance(end_date, str):
-                end_dt = parse_datetime(end_date)
-            else:
-                end_dt = end_date
-            
             # Ensure timezone info - use UTC+0 (UTC timezone)
+            utc = get_utc_now().tzinfo
             if start_dt.tzinfo is None:
-                start_dt = start_dt.replace(tzinfo=get_utc_now().tzinfo)
+                start_dt = start_dt.replace(tzinfo=utc)
             if end_dt.tzinfo is None:
-                end_dt = end_dt.replace(tzinfo=get_utc_now().tzinfo)
+                end_dt = end_dt.replace(tzinfo=utc)
             
-            logger.info(f"✓ Getting {self.symbol} data from {start_dt.strftime('%Y-%m-%d')} to {end_dt.strftime('%Y-%m-%d')} ({self.timeframe})")
+            logger.info("✓ Getting %s data from %s to %s (%s)", self.symbol, start_dt.strftime('%Y-%m-%d'), end_dt.strftime('%Y-%m-%d'), self.timeframe)
             
             # Get MT5 timeframe constant
             mt5_timeframe = self._get_mt5_timeframe(self.timeframe)
@@ -178,38 +201,63 @@ class DataCrawler:
             # Get data from MT5
             rates = mt5.copy_rates_range(self.symbol, mt5_timeframe, start_dt, end_dt)
             
-            if rates is None or len(rates) == 0:
-                logger.error("✗ No data retrieved from MT5")
+            # None means the request failed; an empty array means MT5 simply has no bars in the range
+            if rates is None:
+                logger.error("✗ Failed to retrieve data from MT5: %s", mt5.last_error())
                 return None
             
-            logger.info(f"✓ Retrieved {len(rates)} {self.timeframe} bars from MT5")
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(rates)
-            df['timestamp'] = pd.to_datetime(df['time'], unit='s')
+            if len(rates) == 0:
+                logger.warning("✗ No data retrieved from MT5")
             
-            # Rename columns to match our database schema
-            df = df.rename(columns={
-                'open': 'open',
-                'high': 'high', 
-                'low': 'low',
-                'close': 'close',
-                'tick_volume': 'volume'
-            })
+            logger.info("✓ Retrieved %s %s bars from MT5", len(rates), self.timeframe)
             
-            # Select only the columns we need
-            df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+            # Convert to DataFrame: take only the fields we store, named as in our database schema
+            # (rates['time'] is naive epoch seconds, so no timezone handling is needed).
+            # copy=False keeps the price columns as views into the MT5 rates buffer
+            df = pd.DataFrame({
+                'timestamp': rates['time'].astype('datetime64[s]').astype('datetime64[ns]'),
+                'open': rates['open'],
+                'high': rates['high'],
+                'low': rates['low'],
+                'close': rates['close'],
+                'volume': rates['tick_volume']
+            }, copy=False)
             
-            # Remove timezone info to match database format
-            df['timestamp'] = df['timestamp'].dt.tz_localize(None)
-            
-            logger.info(f"✓ Converted MT5 data to DataFrame format")
+            logger.info("✓ Converted MT5 data to DataFrame format")
             return df
             
         except Exception as e:
-            logger.error(f"Error getting MT5 data: {e}")
+            logger.error("Error getting MT5 data: %s", e)
             return None
 
+    def _start_candle_writer(self):
+        """
+        Start a background thread that saves candle chunks to the database
+        
+        Returns:
+            tuple: (queue, thread, state) - put DataFrames on the queue and None to stop;
+                   state holds the 'saved' count and the first save 'error' (if any)
+        """
+        chunks = queue.Queue(maxsize=2)
+        state = {'saved': 0, 'error': None}
+        
+        def _drain():
+            while True:
+                df = chunks.get()
+                if df is None:
+                    break
+                if state['error'] is not None:
+                    continue  # keep draining so the producer never blocks
+                try:
+                    self.db.save_candles(df, self.timeframe)
+                    state['saved'] += len(df)
+                except Exception as e:
+                    state['error'] = e
+        
+        writer = threading.Thread(target=_drain, name="candle-writer", daemon=True)
+        writer.start()
+        return chunks, writer, state
+
     def crawl_historical_data(self, start_date, end_date):
         """
         Crawl historical OHLCV data for XAU/USD using MetaTrader5
@@ -229,47 +277,79 @@ class DataCrawler:
             start_dt = parse_datetime(start_date) if isinstance(start_date, str) else start_date
             end_dt = parse_datetime(end_date) if isinstance(end_date, str) else end_date
             
-            logger.info(f"Starting MT5 historical data crawl from {start_dt} to {end_dt}")
+            logger.info("Starting MT5 historical data crawl from %s to %s", start_dt, end_dt)
             
-            # Get data from MT5
-            df = self._get_mt5_data(start_dt, end_dt)
-
-            if df is None or df.empty:
+            # Fetch from MT5 in CRAWL_CHUNK_DAYS windows; a writer thread saves each chunk
+            # to the database while the next one is being fetched
+            chunk_span = timedelta(days=CRAWL_CHUNK_DAYS)
+            chunks, writer, write_state = self._start_candle_writer()
+            original_count = 0
+            pending = None  # most recent non-empty chunk, held back until we know it isn't the last
+            failed_chunk = None
+            
+            try:
+                chunk_start = start_dt
+                while chunk_start <= end_dt and write_state['error'] is None:
+                    next_start = chunk_start + chunk_span
+                    chunk_end = min(end_dt, next_start - timedelta(seconds=1))
+                    
+                    df = self._get_mt5_data(chunk_start, chunk_end)
+                    
+                    if df is None:
+                        # A failed window would leave a hole in the middle of the range: stop the crawl
+                        failed_chunk = (chunk_start, chunk_end)
+                        break
+                    
+                    chunk_start = next_start
+                    
+                    if df.empty:
+                        continue
+                    
+                    original_count += len(df)
+                    if pending is not None:
+                        chunks.put(pending)
+                    pending = df
+                
+                if failed_chunk is not None:
+                    # Candles fetched before the failure are all closed, so they are still saved
+                    if pending is not None:
+                        chunks.put(pending)
+                elif pending is not None:
+                    # ĐẶC BIỆT QUAN TRỌNG: Loại bỏ cây nến cuối cùng (luôn là cây nến hiện tại chưa đóng)
+                    pending = pending.iloc[:-1]
+                    logger.info("⚠️ Filtered out last candle (current incomplete candle)")
+                    if not pending.empty:
+                        chunks.put(pending)
+            finally:
+                chunks.put(None)
+                writer.join()
+            
+            if failed_chunk is not None:
+                logger.error("Failed to fetch MT5 data from %s to %s, crawl aborted", failed_chunk[0], failed_chunk[1])
+                self._shutdown_mt5()  # Force a fresh connection on the next crawl
+                return False
+            
+            if original_count == 0:
                 logger.error("Failed to fetch any data from MT5")
-                self._shutdown_mt5()
                 return False
-
-            # ĐẶC BIỆT QUAN TRỌNG: Loại bỏ cây nến cuối cùng (luôn là cây nến hiện tại chưa đóng)
-            original_count = len(df)
-
-            if original_count > 0:
-                # Loại bỏ cây nến cuối cùng (chưa đóng)
-                df = df.iloc[:-1].copy()
-                filtered_count = len(df)
-
-                logger.info(f"⚠️ Filtered out last candle (current incomplete candle)")
-                logger.info(f"Original candles from MT5: {original_count}, Saving: {filtered_count}")
-
-            if df.empty:
+            
+            if write_state['error'] is not None:
+                logger.error("Failed to save candles to database: %s", write_state['error'])
+                return False
+            
+            saved_count = write_state['saved']
+            logger.info("Original candles from MT5: %s, Saving: %s", original_count, saved_count)
+            
+            if saved_count == 0:
                 logger.info("No closed candles to save after filtering")
-                self._shutdown_mt5()
                 return True
-
-            # Save to database
-            try:
-                self.db.save_candles(df, self.timeframe)
-                logger.info(f"Saved {len(df)} {self.timeframe} closed candles to database")
-            except Exception as e:
-                logger.error(f"Failed to save candles to database: {e}")
-                self._shutdown_mt5()
-                return False
             
-            logger.info(f"MT5 historical data crawl completed. Total candles saved: {len(df)}")
-            self._shutdown_mt5()
+            logger.info("Saved %s %s closed candles to database", saved_count, self.timeframe)
+            logger.info("MT5 historical data crawl completed. Total candles saved: %s", saved_count)
             return True
             
         except Exception as e:
-            logger.error(f"Error during MT5 historical data crawl: {e}")
+            logger.error("Error during MT5 historical data crawl: %s", e)
             self._shutdown_mt5()
             return False
 
@@ -289,28 +369,26 @@ class DataCrawler:
             latest_time = self.db.get_latest_candle_time(self.timeframe)
 
             if latest_time is None:
-                logger.warning(f"No existing {self.timeframe} data found. Use crawl_historical_data() instead.")
-                self._shutdown_mt5()
+                logger.warning("No existing %s data found. Use crawl_historical_data() instead.", self.timeframe)
                 return False
 
             # ĐƠN GIẢN: start = latest DB timestamp, end = current time
             start_time = latest_time
             end_time = get_utc3_now().replace(tzinfo=None)
 
-            logger.info(f"Starting MT5 incremental data crawl from {start_time} to {end_time}")
-            logger.info(f"⚠️ Will filter out last candle (current incomplete candle) before saving")
+            logger.info("Starting MT5 incremental data crawl from %s to %s", start_time, end_time)
+            logger.info("⚠️ Will filter out last candle (current incomplete candle) before saving")
 
             # Get new data from MT5
             df = self._get_mt5_data(start_time, end_time)
             
             if df is None:
                 logger.error("Failed to fetch incremental data from MT5")
-                self._shutdown_mt5()
+                self._shutdown_mt5()  # Force a fresh connection on the next crawl
                 return False
             
             if df.empty:
                 logger.info("No new data to crawl")
-                self._shutdown_mt5()
                 return True
 
             # ĐẶC BIỆT QUAN TRỌNG: Loại bỏ cây nến đầu (duplicate) và cây cuối (chưa đóng)
@@ -321,26 +399,24 @@ class DataCrawler:
                 df = df.iloc[1:-1].copy()
                 filtered_count = len(df)
 
-                logger.info(f"⚠️ Filtered out first candle (duplicate) and last candle (incomplete)")
-                logger.info(f"Original candles from MT5: {original_count}, Saving: {filtered_count}")
+                logger.info("⚠️ Filtered out first candle (duplicate) and last candle (incomplete)")
+                logger.info("Original candles from MT5: %s, Saving: %s", original_count, filtered_count)
             elif original_count == 1:
                 # Chỉ có 1 cây nến = cây nến duplicate trong DB
                 df = df.iloc[0:0].copy()  # Empty dataframe
-                logger.info(f"⚠️ Only 1 candle found - duplicate with existing DB record")
+                logger.info("⚠️ Only 1 candle found - duplicate with existing DB record")
 
             if df.empty:
                 logger.info("No new closed candles to save after filtering")
-                self._shutdown_mt5()
                 return True
 
             # Save new data to database
             self.db.save_candles(df, self.timeframe)
-            logger.info(f"MT5 incremental crawl completed. Saved {len(df)} new {self.timeframe} candles")
-            self._shutdown_mt5()
+            logger.info("MT5 incremental crawl completed. Saved %s new %s candles", len(df), self.timeframe)
             return True
             
         except Exception as e:
-            logger.error(f"Error during MT5 incremental data crawl: {e}")
+            logger.error("Error during MT5 incremental data crawl: %s", e)
             self._shutdown_mt5()
             return False
 
@@ -358,10 +434,11 @@ class DataCrawler:
         try:
             logger.info("Starting data integrity validation")
             
-            # Load data from database
-            df = self.db.load_candles(start_date, end_date)
+            # Load only candle timestamps (sorted by the query) from database
+            ts_ns = self.db.load_timestamps(start_date, end_date, self.timeframe)
+            total_candles = len(ts_ns)
             
-            if df.empty:
+            if total_candles == 0:
                 return {
                     'status': 'error',
                     'message': 'No data found in database',
@@ -369,49 +446,50 @@ class DataCrawler:
                     'total_candles': 0
                 }
             
-            # Sort by timestamp
-            df = df.sort_values('timestamp').reset_index(drop=True)
+            # The query orders by timestamp; only sort if that precondition doesn't hold
+            if not np.all(ts_ns[1:] >= ts_ns[:-1]):
+                ts_ns = np.sort(ts_ns)
             
-            # Find gaps (missing candles)
-            gaps = []
-            timeframe_minutes = self._get_timeframe_minutes(self.timeframe)
-            expected_interval = timedelta(minutes=timeframe_minutes)
+            # Find gaps (missing candles): consecutive candles further apart than one interval
+            expected_ns = self._timeframe_minutes * NS_PER_MINUTE
             
-            for i in range(1, len(df)):
-                current_time = df.iloc[i]['timestamp']
-                prev_time = df.iloc[i-1]['timestamp']
-                expected_time = prev_time + expected_interval
-                
-                if current_time > expected_time:
-                    # Found a gap
-                    gap_start = expected_time
-                    gap_end = current_time - expected_interval
-                    gaps.append({
-                        'start': gap_start,
-                        'end': gap_end,
-                        'duration_minutes': int((current_time - prev_time).total_seconds() / 60) - timeframe_minutes
-                    })
-            
-            total_expected = int((df.iloc[-1]['timestamp'] - df.iloc[0]['timestamp']).total_seconds() / (timeframe_minutes * 60)) + 1
-            missing_candles = total_expected - len(df)
-            completeness = (len(df) / total_expected) * 100 if total_expected > 0 else 0
+            starts_ns, ends_ns, durations = _find_gaps(ts_ns, expected_ns)
+            
+            # Convert back to Timestamps only at the gaps
+            gaps = [
+                {
+                    'start': gap_start,
+                    'end': gap_end,
+                    'duration_minutes': duration
+                }
+                for gap_start, gap_end, duration in zip(pd.to_datetime(starts_ns, unit='ns'),
+                                                       pd.to_datetime(ends_ns, unit='ns'),
+                                                       durations.tolist())
+            ]
+            
+            start_time = pd.Timestamp(ts_ns[0], unit='ns')
+            end_time = pd.Timestamp(ts_ns[-1], unit='ns')
+            
+            total_expected = int((ts_ns[-1] - ts_ns[0]) // expected_ns) + 1
+            missing_candles = total_expected - total_candles
+            completeness = (total_candles / total_expected) * 100 if total_expected > 0 else 0
             
             result = {
                 'status': 'success',
-                'total_candles': len(df),
+                'total_candles': total_candles,
                 'expected_candles': total_expected,
                 'missing_candles': missing_candles,
                 'completeness_percent': completeness,
                 'gaps': gaps,
-                'start_time': df.iloc[0]['timestamp'],
-                'end_time': df.iloc[-1]['timestamp']
+                'start_time': start_time,
+                'end_time': end_time
             }
             
-            logger.info(f"Data validation completed: {completeness:.2f}% complete, {len(gaps)} gaps found")
+            logger.info("Data validation completed: %.2f%% complete, %s gaps found", completeness, len(gaps))
             return result
             
         except Exception as e:
-            logger.error(f"Error during data validation: {e}")
+            logger.error("Error during data validation: %s", e)
             return {
                 'status': 'error',
                 'message': str(e),
@@ -419,6 +497,34 @@ class DataCrawler:
                 'total_candles': 0
             }
 
+    def _coalesce_gaps(self, gaps, merge_intervals=GAP_MERGE_INTERVALS):
+        """
+        Merge gaps that lie close together so each cluster is fetched with one MT5 request
+        
+        Args:
+            gaps: list - List of gaps from validate_data_integrity()
+            merge_intervals: int - Merge gaps separated by at most this many candles
+        
+        Returns:
+            list: Merged gaps sorted by start time
+        """
+        if not gaps:
+            return []
+        
+        max_distance = timedelta(minutes=self._timeframe_minutes * merge_intervals)
+        ordered = sorted(gaps, key=lambda gap: gap['start'])
+        
+        merged = [dict(ordered[0])]
+        for gap in ordered[1:]:
+            last = merged[-1]
+            if gap['start'] - last['end'] <= max_distance:
+                last['end'] = max(last['end'], gap['end'])
+                last['duration_minutes'] += gap['duration_minutes']
+            else:
+                merged.append(dict(gap))
+        
+        return merged
+
     def fill_data_gaps(self, gaps):
         """
         Fill identified data gaps by fetching missing data from MetaTrader5
@@ -440,24 +546,33 @@ class DataCrawler:
                 
             total_filled = 0
             
-            for gap in gaps:
-                logger.info(f"Filling gap from {gap['start']} to {gap['end']}")
+            # Candles already in the DB inside a merged range are skipped by save_candles (ON CONFLICT DO NOTHING)
+            merged_gaps = self._coalesce_gaps(gaps)
+            logger.info("Filling %s gaps with %s MT5 requests", len(gaps), len(merged_gaps))
+            
+            for gap in merged_gaps:
+                # Reconnect if a previous fetch failed and dropped the connection
+                if not self._initialize_mt5():
+                    return False
+                
+                logger.info("Filling gap from %s to %s", gap['start'], gap['end'])
                 
                 df = self._get_mt5_data(gap['start'], gap['end'])
                 
                 if df is not None and not df.empty:
-                    self.db.save_candles(df)
-                    total_filled += len(df)
-                    logger.info(f"Filled gap with {len(df)} candles")
+                    inserted = self.db.save_candles(df, self.timeframe)
+                    total_filled += inserted
+                    logger.info("Filled gap with %s new candles (%s fetched)", inserted, len(df))
                 else:
-                    logger.warning(f"Could not fill gap from {gap['start']} to {gap['end']}")
+                    logger.warning("Could not fill gap from %s to %s", gap['start'], gap['end'])
+                    if df is None:
+                        self._shutdown_mt5()
             
-            logger.info(f"MT5 gap filling completed. Total {total_filled} candles added")
-            self._shutdown_mt5()
+            logger.info("MT5 gap filling completed. Total %s candles added", total_filled)
             return True
             
         except Exception as e:
-            logger.error(f"Error during MT5 gap filling: {e}")
+            logger.error("Error during MT5 gap filling: %s", e)
             self._shutdown_mt5()
             return False
 
@@ -469,9 +584,9 @@ class DataCrawler:
             dict: Data summary statistics
         """
         try:
-            df = self.db.load_candles()
+            total_candles, start_date, end_date = self.db.get_summary(self.timeframe)
             
-            if df.empty:
+            if not total_candles:
                 return {
                     'total_candles': 0,
                     'start_date': None,
@@ -479,19 +594,17 @@ class DataCrawler:
                     'date_range_days': 0
                 }
             
-            start_date = df['timestamp'].min()
-            end_date = df['timestamp'].max()
             date_range_days = (end_date - start_date).days
             
             return {
-                'total_candles': len(df),
+                'total_candles': total_candles,
                 'start_date': start_date,
                 'end_date': end_date,
                 'date_range_days': date_range_days
             }
             
         except Exception as e:
-            logger.error(f"Error getting data summary: {e}")
+            logger.error("Error getting data summary: %s", e)
             return {
                 'total_candles': 0,
                 'start_date': None,
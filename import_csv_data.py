@@ -6,7 +6,7 @@ This script imports historical OHLCV data from CSV file into the database.
 It's designed to work with the XAU_15m_data.csv file format.
 
 Usage:
-    python import_csv_data.py [--file CSV_FILE_PATH] [--batch-size BATCH_SIZE] [--dry-run]
+    python import_csv_data.py [--file CSV_FILE_PATH] [--batch-size BATCH_SIZE] [--dry-run] [--skip-existing]
 
 CSV Format Expected (default tab-separated from MT5):
     timestamp\topen\thigh\tlow\tclose\tvolume
@@ -18,15 +18,46 @@ Alternative semicolon-separated format:
 """
 
 import argparse
+import codecs
+import contextlib
+import itertools
+import numpy as np
 import pandas as pd
 import sys
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
 from sqlalchemy import create_engine, text
 from config import DATABASE_URL
 from logger import setup_logger
 
 logger = setup_logger()
 
+# psycopg2 is the PostgreSQL driver behind DATABASE_URL; other drivers use the generic SQLAlchemy insert
+try:
+    from psycopg2.extras import execute_values
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+# Rows per multi-VALUES INSERT statement sent by execute_values
+INSERT_PAGE_SIZE = 1000
+
+# Column order of the insert parameter tuples
+CANDLE_INSERT_COLUMNS = ['timestamp', 'timeframe', 'open', 'high', 'low', 'close', 'volume']
+
+# Bytes read per step when checking that the whole file decodes with a candidate encoding
+ENCODING_CHECK_BLOCK_SIZE = 1 << 20
+
+# Timestamp formats produced by MT5 exports (YYYY-MM-DD HH:MM:SS) and older MT4-style CSVs (YYYY.MM.DD HH:MM)
+CSV_TIMESTAMP_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y.%m.%d %H:%M']
+
+@lru_cache(maxsize=100000)
+def _parse_csv_day(day_str):
+    """Parse the "YYYY.MM.DD" part of a CSV date (cached: intraday rows repeat the same day)"""
+    return datetime.strptime(day_str, "%Y.%m.%d")
+
 class CSVDataImporter:
     def __init__(self):
         self.engine = create_engine(DATABASE_URL)
@@ -79,12 +110,41 @@ class CSVDataImporter:
             datetime: Parsed datetime object
         """
         try:
-            # Convert "2004.06.11 07:15" to datetime
-            return datetime.strptime(date_str, "%Y.%m.%d %H:%M")
+            # Convert "2004.06.11 07:15" to datetime: cached day + HH:MM offset
+            day_str, time_str = date_str.split(' ', 1)
+            hours, minutes = time_str.split(':')
+            hours, minutes = int(hours), int(minutes)
+            if not (0 <= hours < 24 and 0 <= minutes < 60):
+                raise ValueError(f"time data '{date_str}' does not match format '%Y.%m.%d %H:%M'")
+            return _parse_csv_day(day_str) + timedelta(hours=hours, minutes=minutes)
         except ValueError as e:
             logger.error(f"Failed to parse date '{date_str}': {e}")
             return None
 
+    def parse_timestamps(self, timestamps):
+        """
+        Parse a column of timestamp strings in one vectorized call
+        
+        The format is detected from the first value (see CSV_TIMESTAMP_FORMATS), falling back to
+        pandas inference. Values that don't parse become NaT.
+        
+        Args:
+            timestamps: Series of timestamp strings
+        
+        Returns:
+            Series: datetime64 Series
+        """
+        # Already parsed by read_csv (see import_csv_file)
+        if pd.api.types.is_datetime64_any_dtype(timestamps):
+            return timestamps
+        
+        sample = timestamps.dropna().head(1)
+        for date_format in CSV_TIMESTAMP_FORMATS:
+            if pd.to_datetime(sample, format=date_format, errors='coerce').notna().all():
+                return pd.to_datetime(timestamps, format=date_format, errors='coerce', cache=True)
+        
+        return pd.to_datetime(timestamps, errors='coerce', cache=True)
+
     def validate_csv_format(self, df):
         """
         Validate MT5 CSV format: timestamp,open,high,low,close,volume
@@ -108,15 +168,14 @@ class CSVDataImporter:
             return False
         
         # Validate timestamp format
-        sample_dates = df['timestamp'].head(3).tolist()
-        for date_str in sample_dates:
-            try:
-                pd.to_datetime(date_str)
-            except:
-                logger.error(f"Invalid timestamp format: {date_str}")
-                return False
+        sample_dates = df['timestamp'].head(3)
+        parsed_dates = self.parse_timestamps(sample_dates)
+        if parsed_dates.isna().any():
+            logger.error(f"Invalid timestamp format: {sample_dates[parsed_dates.isna()].tolist()}")
+            return False
         
-        logger.info(f"CSV validation passed. Found {len(df)} records")
+        # Only the first chunk is validated here; the total row count is logged once the file is read
+        logger.info("CSV validation passed")
         return True
 
     def process_csv_data(self, df):
@@ -124,40 +183,44 @@ class CSVDataImporter:
         Process MT5 CSV data into the format expected by database
         
         Args:
-            df: Raw DataFrame from CSV
+            df: Raw DataFrame from CSV (modified in place; callers don't reuse it)
         
         Returns:
             DataFrame: Processed DataFrame ready for database insert
         """
         logger.info("Processing MT5 CSV data...")
         
-        # Create a copy to avoid modifying original
-        processed_df = df.copy()
-        
-        # Convert timestamp to datetime
-        processed_df['timestamp'] = pd.to_datetime(processed_df['timestamp'])
+        processed_df = df
         
-        # Remove rows with invalid dates
-        invalid_dates = processed_df['timestamp'].isna()
-        if invalid_dates.any():
-            invalid_count = invalid_dates.sum()
-            logger.warning(f"Removing {invalid_count} rows with invalid dates")
-            processed_df = processed_df.dropna(subset=['timestamp'])
+        # Convert timestamp to datetime (unparseable values become NaT and are removed below)
+        processed_df['timestamp'] = self.parse_timestamps(processed_df['timestamp'])
         
-        # Convert numeric columns to proper types
+        # Convert numeric columns to proper types (read_csv already infers clean columns as numeric;
+        # only columns with non-numeric cells come back as text)
         numeric_columns = ['open', 'high', 'low', 'close', 'volume']
         for col in numeric_columns:
-            processed_df[col] = pd.to_numeric(processed_df[col], errors='coerce')
-        
-        # Remove rows with invalid numeric data
-        invalid_numeric = processed_df[numeric_columns].isna().any(axis=1)
-        if invalid_numeric.any():
-            invalid_count = invalid_numeric.sum()
-            logger.warning(f"Removing {invalid_count} rows with invalid numeric data")
-            processed_df = processed_df.dropna(subset=numeric_columns)
-        
-        # Sort by timestamp
-        processed_df = processed_df.sort_values('timestamp').reset_index(drop=True)
+            if not pd.api.types.is_numeric_dtype(processed_df[col]):
+                processed_df[col] = pd.to_numeric(processed_df[col], errors='coerce')
+        
+        # Remove rows with invalid dates or numeric data in a single filter
+        invalid_dates = processed_df['timestamp'].isna().to_numpy()
+        invalid_numeric = np.logical_or.reduce([processed_df[col].isna().to_numpy() for col in numeric_columns])
+        invalid_rows = invalid_dates | invalid_numeric
+        if invalid_rows.any():
+            if invalid_dates.any():
+                logger.warning(f"Removing {invalid_dates.sum()} rows with invalid dates")
+            invalid_numeric_count = (invalid_numeric & ~invalid_dates).sum()
+            if invalid_numeric_count:
+                logger.warning(f"Removing {invalid_numeric_count} rows with invalid numeric data")
+            processed_df = processed_df[~invalid_rows]
+        
+        # Cast once here so import batches can be converted to records without per-row coercion
+        processed_df = processed_df.astype({
+            'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64', 'volume': 'int64'
+        })
+        
+        # Sort by timestamp (stable sort is linear on the already-ordered runs of MT5 exports)
+        processed_df = processed_df.sort_values('timestamp', kind='stable', ignore_index=True)
         
         logger.info(f"Data processing completed. {len(processed_df)} records ready for import")
         return processed_df
@@ -195,52 +258,95 @@ class CSVDataImporter:
             logger.error(f"Failed to get existing data range: {e}")
             return None
 
-    def import_data_batch(self, df_batch, batch_num, total_batches, timeframe='15m'):
+    def import_data_batch(self, conn, df_batch, batch_num, total_batches, timeframe='15m'):
         """
         Import a batch of data into database
         
         Args:
+            conn: Open connection; the caller owns the transaction and commits it
             df_batch: DataFrame batch to import
             batch_num: Current batch number
-            total_batches: Total number of batches
+            total_batches: Total number of batches (None if not known up front)
             timeframe: Timeframe for the data
         
         Returns:
             int: Number of records successfully inserted
+        
+        Raises:
+            Exception: Re-raised after logging, since a failed statement aborts the whole transaction
         """
         try:
-            logger.info(f"Importing batch {batch_num}/{total_batches} ({len(df_batch)} records) for {timeframe}")
+            batch_label = f"{batch_num}/{total_batches}" if total_batches else f"{batch_num}"
+            logger.info(f"Importing batch {batch_label} ({len(df_batch)} records) for {timeframe}")
             
-            # Prepare data for bulk insert
-            records = []
-            for _, row in df_batch.iterrows():
-                records.append({
-                    'timestamp': row['timestamp'],
-                    'timeframe': timeframe,
-                    'open': float(row['open']),
-                    'high': float(row['high']),
-                    'low': float(row['low']),
-                    'close': float(row['close']),
-                    'volume': int(row['volume'])
-                })
+            # Prepare data for bulk insert: zip the column lists into row tuples (dtypes are already cast
+            # in process_csv_data, so tolist() yields plain Python values) without building another DataFrame
+            rows = list(zip(
+                df_batch['timestamp'].tolist(),
+                itertools.repeat(timeframe),
+                df_batch['open'].tolist(),
+                df_batch['high'].tolist(),
+                df_batch['low'].tolist(),
+                df_batch['close'].tolist(),
+                df_batch['volume'].tolist()
+            ))
             
-            # Use bulk insert with ON CONFLICT DO NOTHING (updated for timestamp + timeframe)
-            with self.engine.connect() as conn:
+            if PSYCOPG2_AVAILABLE and self.engine.dialect.driver == 'psycopg2':
+                inserted_count = self._insert_batch_execute_values(conn, rows)
+            else:
+                # Use bulk insert with ON CONFLICT DO NOTHING (updated for timestamp + timeframe)
                 result = conn.execute(text("""
                     INSERT INTO candles (timestamp, timeframe, open, high, low, close, volume)
                     VALUES (:timestamp, :timeframe, :open, :high, :low, :close, :volume)
                     ON CONFLICT (timestamp, timeframe) DO NOTHING
-                """), records)
-                
-                conn.commit()
+                """), [dict(zip(CANDLE_INSERT_COLUMNS, row)) for row in rows])
                 inserted_count = result.rowcount
-                
-                logger.info(f"Batch {batch_num}/{total_batches} completed: {inserted_count} new {timeframe} records inserted")
-                return inserted_count
+            
+            logger.info(f"Batch {batch_label} completed: {inserted_count} new {timeframe} records inserted")
+            return inserted_count
                 
         except Exception as e:
             logger.error(f"Failed to import batch {batch_num}: {e}")
-            return 0
+            raise
+
+    def _insert_batch_execute_values(self, conn, rows):
+        """
+        Insert a batch through psycopg2 execute_values (multi-row VALUES statements)
+        
+        Args:
+            conn: Open SQLAlchemy connection (its transaction is used, not committed here)
+            rows: List of tuples in CANDLE_INSERT_COLUMNS order
+        
+        Returns:
+            int: Number of records inserted (conflicting rows are skipped)
+        """
+        cursor = conn.connection.cursor()
+        try:
+            # cursor.rowcount only covers the last page, so count inserted rows via RETURNING
+            inserted = execute_values(cursor, """
+                INSERT INTO candles (timestamp, timeframe, open, high, low, close, volume)
+                VALUES %s
+                ON CONFLICT (timestamp, timeframe) DO NOTHING
+                RETURNING 1
+            """, rows, page_size=INSERT_PAGE_SIZE, fetch=True)
+            return len(inserted)
+        finally:
+            cursor.close()
+
+    def _import_batch_in_transaction(self, df_batch, batch_num, timeframe):
+        """
+        Import a batch on its own pooled connection and commit it (used by parallel imports)
+        
+        Args:
+            df_batch: DataFrame batch to import
+            batch_num: Current batch number
+            timeframe: Timeframe for the data
+        
+        Returns:
+            int: Number of records successfully inserted
+        """
+        with self.engine.begin() as conn:
+            return self.import_data_batch(conn, df_batch, batch_num, None, timeframe)
 
     def convert_delimiter_name(self, delimiter_name):
         """
@@ -267,7 +373,33 @@ class CSVDataImporter:
         # If it's already a character (like ';', ','), return as-is
         return delimiter_name
 
-    def import_csv_file(self, csv_file_path, batch_size=1000, dry_run=False, timeframe=None, delimiter='tab'):
+    def file_decodes_with(self, csv_file_path, encoding):
+        """
+        Check that the whole file decodes with an encoding, without parsing it
+        
+        The CSV is streamed in chunks, so a bad byte near the end of the file would otherwise only
+        surface after earlier chunks were already imported.
+        
+        Args:
+            csv_file_path: Path to CSV file
+            encoding: Encoding name to check
+        
+        Returns:
+            bool: True if every byte decodes, False otherwise
+        """
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(csv_file_path, 'rb') as f:
+                while block := f.read(ENCODING_CHECK_BLOCK_SIZE):
+                    decoder.decode(block)
+                decoder.decode(b'', final=True)
+        except UnicodeDecodeError as e:
+            logger.warning(f"Failed to read with {encoding}: {e}")
+            return False
+        return True
+
+    def import_csv_file(self, csv_file_path, batch_size=10000, dry_run=False, timeframe=None, delimiter='tab',
+                        skip_existing=False, workers=1):
         """
         Import data from CSV file into database
         
@@ -277,6 +409,10 @@ class CSVDataImporter:
             dry_run: If True, only validate and show statistics without importing
             timeframe: Timeframe for the data (auto-detected from filename if None)
             delimiter: CSV delimiter ('tab', 'comma', 'semicolon', 'pipe', 'space' or actual character)
+            skip_existing: If True, drop rows inside the existing DB date range for this timeframe before
+                inserting (faster for appending new data, but gaps inside that range are not filled)
+            workers: Number of batches inserted in parallel on separate connections. With 1 (default) the
+                whole file is imported in a single transaction; with more, each batch commits on its own
         
         Returns:
             bool: True if successful, False otherwise
@@ -299,71 +435,136 @@ class CSVDataImporter:
             
             # Try different encodings to handle BOM and various MT5 export formats
             encodings_to_try = ['utf-8-sig', 'utf-8', 'utf-16', 'cp1252', 'iso-8859-1']
-            df = None
+            reader = None
+            first_chunk = None
             
             for encoding in encodings_to_try:
                 try:
                     logger.info(f"Trying encoding: {encoding} with delimiter: '{csv_delimiter}'")
-                    df = pd.read_csv(csv_file_path, sep=csv_delimiter, encoding=encoding)
+                    if not self.file_decodes_with(csv_file_path, encoding):
+                        continue
+                    # Stream the file in batch_size chunks so only one chunk is in memory at a time.
+                    # Parse the first (timestamp) column while reading for the default MT5 format;
+                    # any other format is left as text and parsed in process_csv_data.
+                    # memory_map lets the C parser read straight from the mapped file
+                    reader = pd.read_csv(csv_file_path, sep=csv_delimiter, encoding=encoding, engine='c',
+                                         memory_map=True, parse_dates=[0], date_format=CSV_TIMESTAMP_FORMATS[0],
+                                         chunksize=batch_size)
+                    first_chunk = reader.get_chunk()
                     logger.info(f"Successfully read CSV with {encoding} encoding and '{csv_delimiter}' delimiter")
                     break
                 except UnicodeDecodeError as e:
                     logger.warning(f"Failed to read with {encoding}: {e}")
-                    continue
                 except Exception as e:
                     logger.warning(f"Error with {encoding} and delimiter '{csv_delimiter}': {e}")
-                    continue
+                
+                if reader is not None:
+                    reader.close()
+                    reader = None
             
-            if df is None:
+            if reader is None:
                 logger.error("Failed to read CSV file with any supported encoding")
                 return False
+            
+            with reader:
+                # Validate CSV format (columns and timestamps are checked on the first chunk)
+                if not self.validate_csv_format(first_chunk):
+                    return False
+                
+                # Check existing data for this timeframe
+                existing_range = self.get_existing_data_range(timeframe)
+                if existing_range:
+                    logger.info(f"Existing DB data for {timeframe}: {existing_range['total_count']} records from {existing_range['min_date']} to {existing_range['max_date']}")
+                else:
+                    logger.info(f"No existing {timeframe} data in database")
+                
+                skip_range = None
+                if skip_existing and existing_range:
+                    skip_range = (pd.Timestamp(existing_range['min_date']), pd.Timestamp(existing_range['max_date']))
+                    logger.warning(f"Skipping all CSV rows from {skip_range[0]} to {skip_range[1]}; "
+                                   f"candles missing from the database inside that range will not be filled")
+                
+                if dry_run:
+                    logger.info("DRY RUN MODE - No data will be imported")
+                else:
+                    logger.info(f"Starting import in batches of {batch_size} records")
+                
+                # Process and import data chunk by chunk
+                total_read = 0
+                total_processed = 0
+                total_inserted = 0
+                total_skipped = 0
+                total_batches = 0
+                min_date = None
+                max_date = None
+                
+                # With workers > 1 batches are inserted (and committed) on pooled connections while the next
+                # chunk is parsed; at most 2 * workers processed chunks are held in memory
+                parallel = workers > 1 and not dry_run
+                pending = deque()
                 
-            logger.info(f"CSV file loaded: {len(df)} records")
+                with contextlib.ExitStack() as stack:
+                    if parallel:
+                        executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+                    elif not dry_run:
+                        # One transaction for the whole import: a single commit at the end instead of one per
+                        # batch, and a failed batch rolls back the entire file (a dry run never connects)
+                        conn = stack.enter_context(self.engine.begin())
+                    
+                    for chunk in itertools.chain([first_chunk], reader):
+                        total_read += len(chunk)
+                        processed_df = self.process_csv_data(chunk)
+                        if processed_df.empty:
+                            continue
+                        
+                        total_processed += len(processed_df)
+                        
+                        # Chunks are sorted by process_csv_data
+                        chunk_min = processed_df['timestamp'].iloc[0]
+                        chunk_max = processed_df['timestamp'].iloc[-1]
+                        min_date = chunk_min if min_date is None else min(min_date, chunk_min)
+                        max_date = chunk_max if max_date is None else max(max_date, chunk_max)
+                        
+                        if skip_range:
+                            outside_existing = ((processed_df['timestamp'] < skip_range[0]) |
+                                                (processed_df['timestamp'] > skip_range[1]))
+                            total_skipped += len(processed_df) - int(outside_existing.sum())
+                            processed_df = processed_df[outside_existing]
+                            if processed_df.empty:
+                                continue
+                        
+                        total_batches += 1
+                        if parallel:
+                            if len(pending) >= 2 * workers:
+                                total_inserted += pending.popleft().result()
+                            pending.append(executor.submit(self._import_batch_in_transaction,
+                                                           processed_df, total_batches, timeframe))
+                        elif not dry_run:
+                            total_inserted += self.import_data_batch(conn, processed_df, total_batches, None, timeframe)
+                    
+                    for future in pending:
+                        total_inserted += future.result()
             
-            # Validate CSV format
-            if not self.validate_csv_format(df):
-                return False
+            logger.info(f"CSV file loaded: {total_read} records")
             
-            # Process data
-            processed_df = self.process_csv_data(df)
-            if processed_df.empty:
+            if total_processed == 0:
                 logger.error("No valid data to import after processing")
                 return False
             
             # Show data range information
-            min_date = processed_df['timestamp'].min()
-            max_date = processed_df['timestamp'].max()
             logger.info(f"CSV data range: {min_date} to {max_date}")
             
-            # Check existing data for this timeframe
-            existing_range = self.get_existing_data_range(timeframe)
-            if existing_range:
-                logger.info(f"Existing DB data for {timeframe}: {existing_range['total_count']} records from {existing_range['min_date']} to {existing_range['max_date']}")
-            else:
-                logger.info(f"No existing {timeframe} data in database")
+            if skip_range:
+                logger.info(f"Rows skipped inside existing DB range: {total_skipped}")
             
             if dry_run:
-                logger.info("DRY RUN MODE - No data will be imported")
-                logger.info(f"Would import {len(processed_df)} records in {(len(processed_df) + batch_size - 1) // batch_size} batches")
+                logger.info(f"Would import {total_processed - total_skipped} records in {total_batches} batches")
                 return True
             
-            # Import data in batches
-            total_inserted = 0
-            total_batches = (len(processed_df) + batch_size - 1) // batch_size
-            
-            logger.info(f"Starting import of {len(processed_df)} records in {total_batches} batches")
-            
-            for i in range(0, len(processed_df), batch_size):
-                batch_df = processed_df.iloc[i:i+batch_size]
-                batch_num = (i // batch_size) + 1
-                
-                inserted = self.import_data_batch(batch_df, batch_num, total_batches, timeframe)
-                total_inserted += inserted
-            
             logger.info(f"Import completed successfully!")
-            logger.info(f"Total records processed: {len(processed_df)}")
+            logger.info(f"Total records processed: {total_processed}")
             logger.info(f"Total new records inserted: {total_inserted}")
-            logger.info(f"Duplicates skipped: {len(processed_df) - total_inserted}")
+            logger.info(f"Duplicates skipped: {total_processed - total_skipped - total_inserted}")
             
             return True
             
@@ -388,22 +589,30 @@ Examples:
   python import_csv_data.py --delimiter comma                # Import comma-separated CSV
   python import_csv_data.py --delimiter semicolon            # Import semicolon-separated CSV
   python import_csv_data.py --delimiter ";"                  # Import using actual semicolon character
-  python import_csv_data.py --batch-size 5000                # Use larger batch size
+  python import_csv_data.py --batch-size 50000               # Use larger batch size
   python import_csv_data.py --dry-run                        # Validate only, don't import
+  python import_csv_data.py --skip-existing                  # Only import rows outside the DB's min-max range (gaps inside are not filled)
+  python import_csv_data.py --workers 4                      # Insert 4 batches in parallel (each batch commits separately)
   python import_csv_data.py --file data.csv --delimiter comma --dry-run  # Test comma-separated file validation
         """
     )
     
     parser.add_argument('--file', type=str, default='xauusd_export.csv',
                        help='Path to CSV file (default: xauusd_export.csv from MT5)')
-    parser.add_argument('--batch-size', type=int, default=1000,
-                       help='Number of records to process in each batch (default: 1000)')
+    parser.add_argument('--batch-size', type=int, default=10000,
+                       help='Number of records to process in each batch (default: 10000)')
     parser.add_argument('--timeframe', type=str, default=None,
                        help='Timeframe for the data (e.g., 15m, 1h, 4h, 1d). Auto-detected from filename if not provided')
     parser.add_argument('--delimiter', type=str, default='tab',
                        help='CSV delimiter: tab, comma, semicolon, pipe, space or actual character like ";" or "," (default: tab)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Validate file and show statistics without importing data')
+    parser.add_argument('--skip-existing', action='store_true',
+                       help='Drop every CSV row between the earliest and latest timestamp already in the database for this '
+                            'timeframe, whether or not that candle exists (faster appends). Gaps inside that range '
+                            'are NOT filled; import without this flag to fill them')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of batches to insert in parallel; >1 commits each batch separately instead of one transaction (default: 1)')
     
     args = parser.parse_args()
     
@@ -417,7 +626,9 @@ Examples:
             batch_size=args.batch_size,
             dry_run=args.dry_run,
             timeframe=args.timeframe,
-            delimiter=args.delimiter
+            delimiter=args.delimiter,
+            skip_existing=args.skip_existing,
+            workers=args.workers
         )
         
         importer.close()
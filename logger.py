@@ -1,13 +1,15 @@
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from config import LOG_LEVEL, LOG_DIR
 
+@lru_cache(maxsize=None)
 def setup_logger(name="XAUSignalTools"):
-    # Create logs directory if it doesn't exist
-    os.makedirs(LOG_DIR, exist_ok=True)
-    
-    # Create logger
+    # Cached per name: every module calls this at import, only the first call configures the logger
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, LOG_LEVEL.upper()))
     
@@ -15,6 +17,9 @@ def setup_logger(name="XAUSignalTools"):
     if logger.handlers:
         return logger
     
+    # Create logs directory if it doesn't exist
+    os.makedirs(LOG_DIR, exist_ok=True)
+    
     # Create formatters
     detailed_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -34,8 +39,23 @@ def setup_logger(name="XAUSignalTools"):
     file_handler.setLevel(getattr(logging, LOG_LEVEL.upper()))
     file_handler.setFormatter(detailed_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Log calls only enqueue the record; a background listener thread does the console/file writes
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Drains queued records before the process exits
+    
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    
+    def _use_direct_handlers():
+        # A forked child has the queue but not the listener thread, so records would never be written
+        logger.removeHandler(queue_handler)
+        atexit.unregister(listener.stop)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+    
+    if hasattr(os, 'register_at_fork'):  # POSIX only; spawned processes set up their own listener
+        os.register_at_fork(after_in_child=_use_direct_handlers)
     
     return logger
\ No newline at end of file
@@ -2,15 +2,16 @@
 
 import argparse
 import sys
+from collections import Counter
 from datetime import datetime
 from data_crawler import DataCrawler
 from signal_detector import SignalDetector
 from backtester import Backtester
-from models import Database
+from models import Database, dispose_engine
 from config import CRAWL_START_DATE, CRAWL_END_DATE, BACKTEST_START_DATE, BACKTEST_END_DATE, DEFAULT_TIMEFRAME, ENABLE_TELEGRAM_NOTIFICATIONS
 from logger import setup_logger
-from utils import create_directories, parse_datetime
-from telegram_utils import send_signal_notification, send_backtest_summary, test_telegram_connection
+from utils import create_directories, parse_datetime, TIMEFRAME_MINUTES
+from telegram_utils import send_signal_notification, send_backtest_summary, test_telegram_connection, close_telegram_connection
 
 logger = setup_logger()
 
@@ -29,6 +30,7 @@ Examples:
   %(prog)s detect --start-date "2024-06-01 00:00:00" --end-date "2024-06-30 23:59:59"
   %(prog)s backtest --start-date "2024-01-01 00:00:00" --end-date "2024-12-31 23:59:59" --timeframe 15m
   %(prog)s backtest --timeframe 1h  # Backtest 1H data using config dates
+  %(prog)s backtest --sweep 15m,1h,4h  # Backtest several timeframes in parallel processes
   %(prog)s daemon start  # Start continuous crawling daemon
   %(prog)s daemon stop   # Stop daemon
   %(prog)s daemon status # Check daemon status
@@ -59,6 +61,8 @@ Examples:
     backtest_parser.add_argument('--end-date', type=str, help='Backtest end date')
     backtest_parser.add_argument('--timeframe', type=str, default=DEFAULT_TIMEFRAME, help=f'Timeframe for backtest data (1m, 5m, 15m, 30m, 1h, 4h, 1d). Default: {DEFAULT_TIMEFRAME}')
     backtest_parser.add_argument('--export', action='store_true', default=True, help='Export results to CSV (default: True)')
+    backtest_parser.add_argument('--sweep', type=str, help='Comma-separated timeframes to backtest in parallel (e.g. 15m,1h,4h); overrides --timeframe. '
+                                      'Results are printed/exported per timeframe; no Telegram summary is sent')
     
     # Daemon command
     daemon_parser = subparsers.add_parser('daemon', help='Daemon mode for continuous crawling and signal detection')
@@ -172,15 +176,17 @@ def handle_detect_command(args):
         print(f"\nDETECTED SIGNALS SUMMARY:")
         print(f"Total signals: {len(signals)}")
         
-        long_signals = [s for s in signals if s['signal_type'] == 'LONG']
-        short_signals = [s for s in signals if s['signal_type'] == 'SHORT']
-        engulfing_signals = [s for s in signals if s['condition'] == 'ENGULFING']
-        inside_bar_signals = [s for s in signals if s['condition'] == 'INSIDE_BAR']
-        
-        print(f"LONG signals: {len(long_signals)}")
-        print(f"SHORT signals: {len(short_signals)}")
-        print(f"Engulfing patterns: {len(engulfing_signals)}")
-        print(f"Inside bar patterns: {len(inside_bar_signals)}")
+        # Count signal types and conditions in a single pass
+        type_counts = Counter()
+        condition_counts = Counter()
+        for s in signals:
+            type_counts[s['signal_type']] += 1
+            condition_counts[s['condition']] += 1
+        
+        print(f"LONG signals: {type_counts['LONG']}")
+        print(f"SHORT signals: {type_counts['SHORT']}")
+        print(f"Engulfing patterns: {condition_counts['ENGULFING']}")
+        print(f"Inside bar patterns: {condition_counts['INSIDE_BAR']}")
 
         # Export to CSV if requested
         if args.export:
@@ -213,6 +219,9 @@ def handle_backtest_command(args):
         start_date = args.start_date or BACKTEST_START_DATE
         end_date = args.end_date or BACKTEST_END_DATE
         
+        if args.sweep:
+            return handle_backtest_sweep(args, start_date, end_date)
+        
         logger.info(f"Starting backtest from {start_date} to {end_date} with {args.timeframe} timeframe")
         
         backtester = Backtester(timeframe=args.timeframe)
@@ -249,6 +258,52 @@ def handle_backtest_command(args):
         logger.error(f"Error in backtest command: {e}")
         return False
 
+def handle_backtest_sweep(args, start_date, end_date):
+    """
+    Run the backtest for every timeframe in --sweep in parallel and report each one
+    
+    Unlike a single-timeframe backtest, no Telegram summary is sent (the summary message
+    doesn't name the timeframe, so one per timeframe would be indistinguishable).
+    """
+    # dict.fromkeys drops repeated timeframes but keeps the order given
+    timeframes = list(dict.fromkeys(tf.strip() for tf in args.sweep.split(',') if tf.strip()))
+    if not timeframes:
+        logger.error(f"No timeframes given in --sweep '{args.sweep}'")
+        return False
+    
+    unknown = [tf for tf in timeframes if tf not in TIMEFRAME_MINUTES]
+    if unknown:
+        logger.error(f"Unsupported timeframe(s) in --sweep: {', '.join(unknown)}. "
+                     f"Supported: {', '.join(TIMEFRAME_MINUTES)}")
+        return False
+    
+    try:
+        logger.info(f"Starting backtest sweep from {start_date} to {end_date} for {', '.join(timeframes)}")
+        
+        sweep_results = Backtester.run_sweep(timeframes, start_date, end_date)
+        
+        for timeframe in timeframes:
+            results = sweep_results.get(timeframe, [])
+            print(f"\n{'=' * 60}\n{timeframe} BACKTEST\n{'=' * 60}")
+            
+            if not results:
+                logger.warning(f"No trades were executed during backtest period for {timeframe}")
+                continue
+            
+            Backtester.analyze_results(results)
+            
+            if args.export:
+                filepath = Backtester.export_results(results, f"backtest_results_{timeframe}")
+                if filepath:
+                    print(f"\nResults exported to: {filepath}")
+        
+        logger.info("Backtest sweep completed successfully")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error in backtest sweep: {e}")
+        return False
+
 def handle_status_command(args):
     """Handle status command"""
     try:
@@ -537,6 +592,9 @@ def main():
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         return 1
+    finally:
+        close_telegram_connection()
+        dispose_engine()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -2,6 +2,8 @@ from sqlalchemy import create_engine, Column, Integer, DECIMAL, TIMESTAMP, Strin
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import io
+import numpy as np
 import pandas as pd
 from config import DATABASE_URL
 from logger import setup_logger
@@ -9,6 +11,31 @@ from logger import setup_logger
 Base = declarative_base()
 logger = setup_logger()
 
+# Rows fetched per chunk when streaming candles out of the database
+CANDLE_LOAD_CHUNKSIZE = 50_000
+
+# Process-wide engine shared by every Database instance (see get_engine)
+_engine = None
+_schema_checked = False
+
+def get_engine():
+    """Return the shared SQLAlchemy engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        # pre_ping/recycle keep pooled connections usable across long daemon idle periods
+        _engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_recycle=1800)
+    return _engine
+
+def dispose_engine():
+    """Close the shared engine's pooled connections; call once at process shutdown"""
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+# In-memory dtypes of loaded candle columns (DECIMAL prices as float64, not Decimal objects)
+CANDLE_DTYPES = {'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64', 'volume': 'int64'}
+
 class Candle(Base):
     __tablename__ = 'candles'
     
@@ -39,13 +66,17 @@ class Signal(Base):
 
 class Database:
     def __init__(self):
-        self.engine = create_engine(DATABASE_URL)
+        self.engine = get_engine()
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         self.connect()
 
     def connect(self):
+        global _schema_checked
         try:
-            Base.metadata.create_all(bind=self.engine)
+            # Tables only need to be created/checked once per process
+            if not _schema_checked:
+                Base.metadata.create_all(bind=self.engine)
+                _schema_checked = True
             logger.info("Connected to PostgreSQL database")
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
@@ -55,77 +86,174 @@ class Database:
         return self.SessionLocal()
 
     def save_candles(self, df, timeframe='15m'):
+        """
+        Insert candles, skipping any (timestamp, timeframe) already stored
+        
+        Returns:
+            int: Number of new candles inserted
+        """
+        session = None
         try:
-            session = self.get_session()
-            candles = []
+            # Build the insert parameters column-wise (one cast per column, no per-row objects)
+            candles = df[['timestamp', 'open', 'high', 'low', 'close']].astype({
+                'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64'
+            })
+            candles['volume'] = df['volume'].astype('int64') if 'volume' in df.columns else 0
+            candles['timeframe'] = timeframe
             
-            for _, row in df.iterrows():
-                candle = Candle(
-                    timestamp=row['timestamp'],
-                    timeframe=timeframe,
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=int(row.get('volume', 0))
-                )
-                candles.append(candle)
+            if self.engine.dialect.driver == 'psycopg2':
+                # PostgreSQL: stream the rows with COPY, then insert them with the same conflict rule
+                inserted = self._copy_candles(candles)
+            else:
+                session = self.get_session()
+                
+                # Use bulk insert with on conflict ignore (updated for timestamp + timeframe)
+                result = session.execute(text("""
+                    INSERT INTO candles (timestamp, timeframe, open, high, low, close, volume)
+                    VALUES (:timestamp, :timeframe, :open, :high, :low, :close, :volume)
+                    ON CONFLICT (timestamp, timeframe) DO NOTHING
+                """), candles.to_dict(orient='records'))
+                inserted = result.rowcount
+                
+                session.commit()
             
-            # Use bulk insert with on conflict ignore (updated for timestamp + timeframe)
-            session.execute(text("""
-                INSERT INTO candles (timestamp, timeframe, open, high, low, close, volume)
-                VALUES (:timestamp, :timeframe, :open, :high, :low, :close, :volume)
-                ON CONFLICT (timestamp, timeframe) DO NOTHING
-            """), [
-                {
-                    'timestamp': candle.timestamp,
-                    'timeframe': candle.timeframe,
-                    'open': candle.open,
-                    'high': candle.high,
-                    'low': candle.low,
-                    'close': candle.close,
-                    'volume': candle.volume
-                } for candle in candles
-            ])
-            
-            session.commit()
-            logger.info(f"Saved {len(candles)} {timeframe} candles to database")
+            logger.info(f"Saved {inserted} new of {len(candles)} {timeframe} candles to database")
+            return inserted
             
         except Exception as e:
-            session.rollback()
+            if session is not None:
+                session.rollback()
             logger.error(f"Failed to save candles: {e}")
             raise
         finally:
-            session.close()
+            if session is not None:
+                session.close()
+
+    def _copy_candles(self, candles):
+        """
+        Bulk insert candles via COPY into a temp table + INSERT ... SELECT ... ON CONFLICT DO NOTHING
+        
+        Args:
+            candles: DataFrame with timestamp, timeframe, open, high, low, close, volume columns
+        
+        Returns:
+            int: Number of new candles inserted
+        """
+        columns = 'timestamp, timeframe, open, high, low, close, volume'
+        buffer = io.StringIO()
+        candles.to_csv(buffer, index=False, header=False,
+                       columns=['timestamp', 'timeframe', 'open', 'high', 'low', 'close', 'volume'])
+        buffer.seek(0)
+        
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            # Explicit columns (not LIKE candles) so the staging rows don't draw ids from the candles sequence
+            cursor.execute("""
+                CREATE TEMP TABLE tmp_candles (
+                    timestamp TIMESTAMP NOT NULL,
+                    timeframe VARCHAR(10) NOT NULL,
+                    open DECIMAL(10, 5) NOT NULL,
+                    high DECIMAL(10, 5) NOT NULL,
+                    low DECIMAL(10, 5) NOT NULL,
+                    close DECIMAL(10, 5) NOT NULL,
+                    volume BIGINT NOT NULL
+                ) ON COMMIT DROP
+            """)
+            cursor.copy_expert(f"COPY tmp_candles ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            cursor.execute(f"""
+                INSERT INTO candles ({columns})
+                SELECT {columns} FROM tmp_candles
+                ON CONFLICT (timestamp, timeframe) DO NOTHING
+            """)
+            inserted = cursor.rowcount
+            raw_conn.commit()
+            return inserted
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+    def iter_candles(self, start_time=None, end_time=None, timeframe='15m', chunksize=CANDLE_LOAD_CHUNKSIZE):
+        """
+        Yield candles in timestamp order as DataFrame chunks
+        
+        Rows are streamed from a server-side cursor, so only one chunk is held in memory at a time.
+        
+        Args:
+            start_time: Start of the range (inclusive); the whole timeframe is read if start or end is missing
+            end_time: End of the range (inclusive)
+            timeframe: Timeframe to read
+            chunksize: Rows per chunk
+        
+        Yields:
+            DataFrame: Chunk of candles
+        """
+        if start_time and end_time:
+            # Use SQLAlchemy text with bound parameters
+            query = text("""
+                SELECT * FROM candles 
+                WHERE timestamp >= :start_time AND timestamp <= :end_time AND timeframe = :timeframe
+                ORDER BY timestamp ASC
+            """)
+            params = {"start_time": start_time, "end_time": end_time, "timeframe": timeframe}
+        else:
+            # Simple query without parameters but with timeframe filter
+            query = text("SELECT * FROM candles WHERE timeframe = :timeframe ORDER BY timestamp ASC")
+            params = {"timeframe": timeframe}
+        
+        with self.engine.connect().execution_options(stream_results=True) as conn:
+            for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+                if not chunk.empty:
+                    chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+                
+                # read_sql usually coerces DECIMAL to float already; only cast columns that aren't there yet
+                casts = {col: dtype for col, dtype in CANDLE_DTYPES.items() if chunk[col].dtype != dtype}
+                if casts:
+                    chunk = chunk.astype(casts)
+                yield chunk
 
     def load_candles(self, start_time=None, end_time=None, timeframe='15m'):
+        try:
+            chunks = list(self.iter_candles(start_time, end_time, timeframe))
+            df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+            
+            logger.info(f"Loaded {len(df)} {timeframe} candles from database")
+            return df
+            
+        except Exception as e:
+            logger.error(f"Failed to load candles: {e}")
+            return pd.DataFrame()
+
+    def load_timestamps(self, start_time=None, end_time=None, timeframe='15m'):
+        """
+        Load only candle timestamps, sorted ascending
+        
+        Returns:
+            np.ndarray: int64 nanosecond timestamps (empty on error)
+        """
         try:
             if start_time and end_time:
-                # Use SQLAlchemy text with bound parameters
                 query = text("""
-                    SELECT * FROM candles 
+                    SELECT timestamp FROM candles 
                     WHERE timestamp >= :start_time AND timestamp <= :end_time AND timeframe = :timeframe
                     ORDER BY timestamp ASC
                 """)
-                df = pd.read_sql(query, self.engine, params={
-                    "start_time": start_time, 
-                    "end_time": end_time,
-                    "timeframe": timeframe
-                })
+                params = {"start_time": start_time, "end_time": end_time, "timeframe": timeframe}
             else:
-                # Simple query without parameters but with timeframe filter
-                query = text("SELECT * FROM candles WHERE timeframe = :timeframe ORDER BY timestamp ASC")
-                df = pd.read_sql(query, self.engine, params={"timeframe": timeframe})
+                query = text("SELECT timestamp FROM candles WHERE timeframe = :timeframe ORDER BY timestamp ASC")
+                params = {"timeframe": timeframe}
             
-            if not df.empty:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df = pd.read_sql(query, self.engine, params=params)
+            timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
             
-            logger.info(f"Loaded {len(df)} {timeframe} candles from database")
-            return df
+            logger.info(f"Loaded {len(timestamps)} {timeframe} candle timestamps from database")
+            return timestamps
             
         except Exception as e:
-            logger.error(f"Failed to load candles: {e}")
-            return pd.DataFrame()
+            logger.error(f"Failed to load candle timestamps: {e}")
+            return np.array([], dtype=np.int64)
 
     def save_signals(self, signals):
         try:
@@ -161,6 +289,19 @@ class Database:
             logger.error(f"Failed to get latest candle time: {e}")
             return None
 
+    def get_summary(self, timeframe='15m'):
+        """Return (count, first timestamp, last timestamp) for a timeframe, aggregated in SQL"""
+        try:
+            session = self.get_session()
+            result = session.execute(text("""
+                SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM candles WHERE timeframe = :timeframe
+            """), {"timeframe": timeframe}).one()
+            session.close()
+            return tuple(result)
+        except Exception as e:
+            logger.error(f"Failed to get candle summary: {e}")
+            return (0, None, None)
+
     def close(self):
-        self.engine.dispose()
+        # The engine is shared with other Database instances, so only dispose_engine() closes its pool
         logger.info("Database connection closed")
\ No newline at end of file
@@ -323,13 +323,16 @@ class SignalDetector:
         else:
             end_point = min(end_index + 1, len(df))  # +1 because range is exclusive
         
+        # Convert rows to dicts once instead of per-iteration iloc lookups
+        candles = df.to_dict('records')
+        
         # Iterate through DataFrame starting from start_index to end_point
         for i in range(start_index, end_point):
             # Get the three lookback candles
             # Note: df is sorted DESC, so index 0 is latest
-            n3 = df.iloc[i-3].to_dict()  # lookback 1 (most recent)
-            n2 = df.iloc[i-2].to_dict()  # lookback 2
-            n1 = df.iloc[i-1].to_dict()  # lookback 3 (oldest)
+            n3 = candles[i-3]  # lookback 1 (most recent)
+            n2 = candles[i-2]  # lookback 2
+            n1 = candles[i-1]  # lookback 3 (oldest)
             
             # Detect signal
             signal = self.detect_signal(n1, n2, n3)
@@ -372,9 +375,7 @@ class SignalDetector:
             return None
         
         # Get N1, N2, N3 (ordered chronologically)
-        n1 = target_candles.iloc[0].to_dict()  # oldest
-        n2 = target_candles.iloc[1].to_dict()  # middle  
-        n3 = target_candles.iloc[2].to_dict()  # newest (target time)
+        n1, n2, n3 = target_candles.to_dict('records')  # oldest, middle, newest (target time)
         
         return self.detect_signal(n1, n2, n3)
 
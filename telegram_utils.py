@@ -7,9 +7,10 @@ to Telegram using the Bot API without external libraries.
 """
 
 import json
-import urllib.request
+import select
+import time
+import http.client
 import urllib.parse
-import urllib.error
 from datetime import datetime
 from logger import setup_logger
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
@@ -17,6 +18,10 @@ from utils import format_dual_timezone, convert_to_utc3, get_utc3_now
 
 logger = setup_logger()
 
+# Retry policy for HTTP 429 (Too Many Requests) responses
+MAX_RATE_LIMIT_RETRIES = 3
+MAX_RETRY_AFTER_SECONDS = 60
+
 class TelegramNotifier:
     def __init__(self, bot_token=None, chat_id=None):
         """
@@ -28,7 +33,11 @@ class TelegramNotifier:
         """
         self.bot_token = bot_token or TELEGRAM_BOT_TOKEN
         self.chat_id = chat_id or TELEGRAM_CHAT_ID
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.api_path = f"/bot{self.bot_token}"
+        
+        # Reused HTTPS connection (keep-alive) so bursts of notifications
+        # don't pay a TCP+TLS handshake per message
+        self._connection = None
         
         if not self.bot_token or not self.chat_id:
             logger.warning("Telegram bot token or chat ID not configured. Notifications will be disabled.")
@@ -65,24 +74,31 @@ class TelegramNotifier:
             # Encode data
             data_encoded = urllib.parse.urlencode(data).encode('utf-8')
             
-            # Create request
-            url = f"{self.base_url}/sendMessage"
-            request = urllib.request.Request(url, data=data_encoded, method='POST')
-            request.add_header('Content-Type', 'application/x-www-form-urlencoded')
-            
-            # Send request
-            with urllib.request.urlopen(request, timeout=10) as response:
-                result = json.loads(response.read().decode('utf-8'))
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                # Send request over the kept-alive connection
+                status, headers, body = self._post(f"{self.api_path}/sendMessage", data_encoded)
+                result = json.loads(body.decode('utf-8'))
                 
                 if result.get('ok'):
                     logger.debug("Telegram message sent successfully")
                     return True
-                else:
-                    logger.error(f"Telegram API error: {result.get('description', 'Unknown error')}")
+                
+                if status != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    logger.error(f"Telegram API error ({status}): {result.get('description', 'Unknown error')}")
                     return False
+                
+                # Throttled - wait as long as the server asks, falling back to exponential backoff
+                retry_after = self._get_retry_after(headers, result)
+                if retry_after is None:
+                    retry_after = 2 ** attempt
+                retry_after = min(retry_after, MAX_RETRY_AFTER_SECONDS)
+                logger.warning(f"Telegram rate limit hit, retrying in {retry_after}s "
+                               f"(attempt {attempt + 1}/{MAX_RATE_LIMIT_RETRIES})")
+                time.sleep(retry_after)
                     
-        except urllib.error.URLError as e:
+        except (http.client.HTTPException, OSError) as e:
             logger.error(f"Network error sending Telegram message: {e}")
+            self.close()
             return False
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error in Telegram response: {e}")
@@ -91,6 +107,69 @@ class TelegramNotifier:
             logger.error(f"Unexpected error sending Telegram message: {e}")
             return False
     
+    def _get_connection(self):
+        """Get the persistent HTTPS connection to the Telegram API, opening it if needed"""
+        if self._connection is not None and self._connection.sock is not None:
+            # An idle keep-alive socket only becomes readable when the server has closed it
+            readable, _, _ = select.select([self._connection.sock], [], [], 0)
+            if readable:
+                self.close()
+        if self._connection is None:
+            self._connection = http.client.HTTPSConnection("api.telegram.org", timeout=10)
+        return self._connection
+    
+    @staticmethod
+    def _get_retry_after(headers, result):
+        """
+        Get the server-requested wait for a 429 response
+        
+        Telegram reports it in parameters.retry_after; the Retry-After header is used as a fallback.
+        
+        Returns:
+            int or None: Seconds to wait, or None if the server did not say
+        """
+        retry_after = (result.get('parameters') or {}).get('retry_after')
+        if retry_after is None:
+            retry_after = headers.get('Retry-After')
+        try:
+            return max(0, int(retry_after))
+        except (TypeError, ValueError):
+            return None
+    
+    def _post(self, path, data_encoded):
+        """
+        POST form data over the persistent connection
+        
+        Dropped idle connections are detected before sending (see _get_connection). The request is
+        resent only if sending it failed; once it was sent, a lost response is not retried, since
+        Telegram may already have delivered the message.
+        
+        Returns:
+            tuple: (status_code, response_headers, response_body_bytes)
+        """
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        
+        for attempt in range(2):
+            connection = self._get_connection()
+            try:
+                connection.request('POST', path, body=data_encoded, headers=headers)
+            except (ConnectionResetError, BrokenPipeError):
+                # Connection dropped before the request went out - reconnect and send it once more
+                self.close()
+                if attempt == 1:
+                    raise
+                continue
+            
+            response = connection.getresponse()
+            body = response.read()
+            return response.status, response.headers, body
+    
+    def close(self):
+        """Close the persistent HTTPS connection"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
     def send_signal_notification(self, signal_data):
         """
         Send trading signal notification to Telegram
@@ -364,4 +443,8 @@ def send_system_notification(message, level="INFO"):
 
 def test_telegram_connection():
     """Convenience function to test Telegram connection"""
-    return telegram_notifier.test_connection()
\ No newline at end of file
+    return telegram_notifier.test_connection()
+
+def close_telegram_connection():
+    """Convenience function to close the notifier's HTTPS connection at shutdown"""
+    telegram_notifier.close()
\ No newline at end of file
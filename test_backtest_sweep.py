@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test parallel backtest sweep (Backtester.run_sweep) against sequential backtests
+
+Runs on a temporary SQLite database filled with synthetic candles, so DATABASE_URL is not touched.
+"""
+
+import sys
+from testing_utils import use_temp_database, make_candles, check
+
+# Spawned sweep workers re-import this module and get the same database through the environment
+TEST_DIR = use_temp_database('test_sweep.db', ENABLE_CANDLE_CACHE='false')
+
+from backtester import Backtester
+from models import Database
+from logger import setup_logger
+
+logger = setup_logger()
+
+START_DATE = "2024-03-04 00:00:00"
+END_DATE = "2024-03-22 23:59:59"
+TIMEFRAMES = ['15m', '1h']
+
+def make_timeframes():
+    """1-minute random-walk candles and their 15m/1h resamples (run_backtest needs the 1m data)"""
+    df_1m = make_candles(START_DATE, 19 * 1440, freq='1min')
+    candles = {'1m': df_1m}
+    for timeframe, rule in [('15m', '15min'), ('1h', '1h')]:
+        candles[timeframe] = df_1m.resample(rule, on='timestamp').agg(
+            {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+        ).reset_index()
+    return candles
+
+def main():
+    """Compare run_sweep results with one sequential run_backtest per timeframe"""
+    try:
+        # Parent process opens the shared engine before the sweep starts
+        db = Database()
+        for timeframe, df in make_timeframes().items():
+            db.save_candles(df, timeframe)
+        print(f"Test directory: {TEST_DIR}")
+
+        sequential = {}
+        for timeframe in TIMEFRAMES:
+            backtester = Backtester(timeframe=timeframe)
+            sequential[timeframe] = backtester.run_backtest(START_DATE, END_DATE)
+            backtester.close()
+
+        sweep = Backtester.run_sweep(TIMEFRAMES, START_DATE, END_DATE, max_workers=2)
+
+        print("\n" + "="*60)
+        print("SWEEP VS SEQUENTIAL")
+        print("="*60)
+
+        passed = True
+        for timeframe in TIMEFRAMES:
+            passed &= check(f"{timeframe}: sequential {len(sequential[timeframe])} trades, "
+                            f"sweep {len(sweep.get(timeframe, []))} trades",
+                            sweep.get(timeframe) == sequential[timeframe])
+
+        if not any(sequential.values()):
+            print("WARNING: no trades in synthetic data, comparison is trivial")
+
+        print("="*60)
+        print("ALL PASSED" if passed else "FAILED")
+        return passed
+
+    except Exception as e:
+        logger.error(f"Sweep test failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
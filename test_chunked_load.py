@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test chunked candle loading (Database.iter_candles / load_candles / load_timestamps)
+
+Every chunked read must match a single read_sql of the same query. Runs on a temporary SQLite database.
+"""
+
+import sys
+from testing_utils import use_temp_database, make_candles, check
+
+use_temp_database('test_chunked_load.db')
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from models import Database, CANDLE_DTYPES
+from logger import setup_logger
+
+logger = setup_logger()
+
+TOTAL_CANDLES = 1000
+
+def read_sql_reference(db, start_time, end_time, timeframe):
+    """Single read_sql of the whole result, as load_candles worked before it streamed chunks"""
+    if start_time and end_time:
+        query = text("""
+            SELECT * FROM candles
+            WHERE timestamp >= :start_time AND timestamp <= :end_time AND timeframe = :timeframe
+            ORDER BY timestamp ASC
+        """)
+        params = {"start_time": start_time, "end_time": end_time, "timeframe": timeframe}
+    else:
+        query = text("SELECT * FROM candles WHERE timeframe = :timeframe ORDER BY timestamp ASC")
+        params = {"timeframe": timeframe}
+
+    df = pd.read_sql(query, db.engine, params=params)
+    if not df.empty:
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df.astype(CANDLE_DTYPES)
+
+def main():
+    """Compare chunked loads with the single read_sql reference"""
+    try:
+        db = Database()
+        db.save_candles(make_candles("2024-03-04", TOTAL_CANDLES, "15min"), '15m')
+        # Another timeframe in the same table must never leak into 15m reads
+        db.save_candles(make_candles("2024-03-04", TOTAL_CANDLES // 4, "1h"), '1h')
+
+        ranges = [
+            ("whole timeframe", None, None),
+            ("inclusive bounds", "2024-03-05 00:00:00", "2024-03-07 12:00:00"),
+            ("single candle", "2024-03-05 10:15:00", "2024-03-05 10:15:00"),
+            ("empty range", "2023-01-01 00:00:00", "2023-01-02 00:00:00"),
+        ]
+
+        passed = True
+        for name, start_time, end_time in ranges:
+            reference = read_sql_reference(db, start_time, end_time, '15m')
+            print(f"\n{name}: {len(reference)} candles")
+
+            loaded = db.load_candles(start_time, end_time, '15m')
+            passed &= check("  load_candles matches read_sql", loaded.equals(reference))
+
+            for chunksize in [1, 7, 256, len(reference) or 1, TOTAL_CANDLES * 2]:
+                chunks = list(db.iter_candles(start_time, end_time, '15m', chunksize=chunksize))
+                combined = pd.concat(chunks, ignore_index=True)
+                in_order = combined['timestamp'].is_monotonic_increasing
+                sizes_ok = all(len(chunk) <= chunksize for chunk in chunks)
+                passed &= check(f"  iter_candles chunksize={chunksize}: {len(chunks)} chunks",
+                                combined.equals(reference) and in_order and sizes_ok)
+
+            timestamps = db.load_timestamps(start_time, end_time, '15m')
+            expected_ts = reference['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+            passed &= check("  load_timestamps matches read_sql",
+                            timestamps.dtype == np.int64 and np.array_equal(timestamps, expected_ts))
+
+        print("\n" + "="*60)
+        print("ALL PASSED" if passed else "FAILED")
+        return passed
+
+    except Exception as e:
+        logger.error(f"Chunked load test failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
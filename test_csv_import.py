@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test multi-chunk CSV import (CSVDataImporter.import_csv_file) with and without --skip-existing and --workers
+
+Imports a synthetic MT5 export into a temporary SQLite database in small batches and checks the stored candles.
+"""
+
+import os
+import sys
+from testing_utils import use_temp_database, make_candles, check
+
+TEST_DIR = use_temp_database('test_csv_import.db')
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from import_csv_data import CSVDataImporter
+from models import Database
+from logger import setup_logger
+
+logger = setup_logger()
+
+TOTAL_ROWS = 2500
+BATCH_SIZE = 300  # 9 chunks
+
+def make_csv(path):
+    """
+    Write a tab-separated MT5 export with a duplicate, unordered rows and rows the importer must drop
+
+    Returns:
+        DataFrame: Candles expected in the database after a full import
+    """
+    expected = make_candles("2024-03-04", TOTAL_ROWS, seed=5, decimals=2)
+
+    lines = ["timestamp\topen\thigh\tlow\tclose\tvolume"]
+    for row in expected.itertuples(index=False):
+        lines.append(f"{row.timestamp:%Y-%m-%d %H:%M:%S}\t{row.open}\t{row.high}\t{row.low}\t{row.close}\t{row.volume}")
+        if row.timestamp == pd.Timestamp("2024-03-10 12:00:00"):
+            lines.append(f"{row.timestamp:%Y-%m-%d %H:%M:%S}\t{row.open}\t{row.high}\t{row.low}\t{row.close}\t{row.volume}")
+    # Invalid rows land in later chunks: bad price, bad timestamp
+    lines.insert(900, "2024-03-13 07:07:00\tn/a\t2300\t2290\t2295\t5")
+    lines.insert(1500, "not a date\t2300\t2301\t2299\t2300\t5")
+    # A chunk whose rows are out of order (the importer sorts each chunk)
+    lines[2101], lines[2102] = lines[2102], lines[2101]
+
+    with open(path, 'w', newline='') as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+    return expected
+
+def reset_candles(db, keep=None):
+    """Empty the candles table, optionally re-inserting some candles"""
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM candles"))
+    if keep is not None:
+        db.save_candles(keep, '15m')
+
+def stored_candles(db):
+    df = db.load_candles(timeframe='15m')
+    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].reset_index(drop=True)
+
+def same_candles(stored, expected):
+    expected = expected.astype({'timestamp': 'datetime64[ns]'}).reset_index(drop=True)
+    stored = stored.astype({'timestamp': 'datetime64[ns]'})
+    return stored.equals(expected.astype(stored.dtypes.to_dict()))
+
+def main():
+    """Import the same file in every mode and compare the stored candles"""
+    try:
+        db = Database()
+        importer = CSVDataImporter()
+        csv_path = os.path.join(TEST_DIR, "xauusd_m15_export.csv")
+        expected = make_csv(csv_path)
+
+        # DB already holds a middle range with a hole in it
+        existing = expected.iloc[1000:1600]
+        hole = (existing['timestamp'] >= "2024-03-16 00:00:00") & (existing['timestamp'] < "2024-03-16 06:00:00")
+        existing_with_hole = existing[~hole]
+        outside_existing = ((expected['timestamp'] < existing['timestamp'].iloc[0]) |
+                            (expected['timestamp'] > existing['timestamp'].iloc[-1]))
+
+        passed = True
+        for workers in [1, 3]:
+            print(f"\n{'='*60}\nWORKERS = {workers}\n{'='*60}")
+
+            reset_candles(db)
+            ok = importer.import_csv_file(csv_path, batch_size=BATCH_SIZE, timeframe='15m', workers=workers)
+            passed &= check("full import into empty table", ok and same_candles(stored_candles(db), expected))
+
+            ok = importer.import_csv_file(csv_path, batch_size=BATCH_SIZE, timeframe='15m', workers=workers)
+            passed &= check("re-import inserts nothing new", ok and same_candles(stored_candles(db), expected))
+
+            ok = importer.import_csv_file(csv_path, batch_size=BATCH_SIZE, timeframe='15m', workers=workers,
+                                          dry_run=True)
+            passed &= check("dry run leaves the table unchanged", ok and same_candles(stored_candles(db), expected))
+
+            reset_candles(db, keep=existing_with_hole)
+            ok = importer.import_csv_file(csv_path, batch_size=BATCH_SIZE, timeframe='15m', workers=workers)
+            passed &= check("import without --skip-existing fills the hole",
+                            ok and same_candles(stored_candles(db), expected))
+
+            reset_candles(db, keep=existing_with_hole)
+            ok = importer.import_csv_file(csv_path, batch_size=BATCH_SIZE, timeframe='15m', workers=workers,
+                                          skip_existing=True)
+            with_skip = pd.concat([expected[outside_existing], existing_with_hole]).sort_values('timestamp')
+            passed &= check("--skip-existing imports only outside the DB range (hole stays)",
+                            ok and same_candles(stored_candles(db), with_skip))
+
+        # --dry-run only validates the file, so it must work without a reachable database
+        offline = CSVDataImporter()
+        offline.engine = create_engine(f"sqlite:///{os.path.join(TEST_DIR, 'missing', 'offline.db')}")
+        for workers in [1, 3]:
+            ok = offline.import_csv_file(csv_path, batch_size=BATCH_SIZE, timeframe='15m', workers=workers,
+                                         dry_run=True)
+            passed &= check(f"dry run without a database (workers={workers})", ok)
+        offline.close()
+
+        importer.close()
+
+        print("\n" + "="*60)
+        print("ALL PASSED" if passed else "FAILED")
+        return passed
+
+    except Exception as e:
+        logger.error(f"CSV import test failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test gap detection (_find_gaps) and gap coalescing (DataCrawler._coalesce_gaps)
+
+Uses synthetic 15m XAU candles with daily session breaks and weekends, no database or MT5 needed.
+"""
+
+import sys
+import pandas as pd
+from datetime import timedelta
+from data_crawler import DataCrawler, _find_gaps, NS_PER_MINUTE
+from testing_utils import check
+from logger import setup_logger
+
+logger = setup_logger()
+
+TIMEFRAME_MINUTES = 15
+
+def make_session_timestamps(start="2024-03-03 23:00:00", end="2024-03-15 21:45:00"):
+    """
+    15m candle times for XAU sessions: Sunday 23:00 to Friday 22:00 with a 22:00-23:00 daily break
+    """
+    index = pd.date_range(start, end, freq=f"{TIMEFRAME_MINUTES}min")
+    daily_break = index.hour == 22
+    weekend = ((index.dayofweek == 4) & (index.hour >= 22)) | (index.dayofweek == 5) | \
+              ((index.dayofweek == 6) & (index.hour < 23))
+    return index[~daily_break & ~weekend]
+
+def find_gaps_reference(timestamps, interval):
+    """Plain loop over consecutive candles, as validate_data_integrity did before _find_gaps"""
+    gaps = []
+    for prev, curr in zip(timestamps[:-1], timestamps[1:]):
+        if curr - prev > interval:
+            gaps.append({
+                'start': prev + interval,
+                'end': curr - interval,
+                'duration_minutes': int((curr - prev - interval).total_seconds() // 60)
+            })
+    return gaps
+
+def to_gap_dicts(starts_ns, ends_ns, durations):
+    return [
+        {'start': start, 'end': end, 'duration_minutes': duration}
+        for start, end, duration in zip(pd.to_datetime(starts_ns, unit='ns'),
+                                        pd.to_datetime(ends_ns, unit='ns'),
+                                        durations.tolist())
+    ]
+
+def make_crawler():
+    # DataCrawler() needs MetaTrader5; _coalesce_gaps only uses the timeframe length
+    crawler = DataCrawler.__new__(DataCrawler)
+    crawler._timeframe_minutes = TIMEFRAME_MINUTES
+    return crawler
+
+def test_find_gaps():
+    """_find_gaps must match the reference loop on session breaks, weekends and missing candles"""
+    interval = timedelta(minutes=TIMEFRAME_MINUTES)
+    expected_ns = TIMEFRAME_MINUTES * NS_PER_MINUTE
+    timestamps = make_session_timestamps()
+
+    # Single missing candles, a 2-hour hole, and a candle lost right after a daily break
+    missing = pd.DatetimeIndex(["2024-03-05 10:15:00", "2024-03-05 10:45:00", "2024-03-07 03:00:00",
+                                "2024-03-07 03:15:00", "2024-03-07 03:30:00", "2024-03-07 03:45:00",
+                                "2024-03-07 04:00:00", "2024-03-07 04:15:00", "2024-03-07 04:30:00",
+                                "2024-03-07 04:45:00", "2024-03-12 23:00:00"])
+    timestamps = timestamps.difference(missing)
+
+    ts_ns = timestamps.as_unit("ns").asi8  # same int64 ns layout as Database.load_timestamps
+    found = to_gap_dicts(*_find_gaps(ts_ns, expected_ns))
+    reference = find_gaps_reference(list(timestamps), interval)
+
+    print(f"Candles: {len(timestamps)}, gaps found: {len(found)}, reference: {len(reference)}")
+
+    passed = check("find_gaps matches reference loop", found == reference)
+
+    weekend = [gap for gap in found if gap['start'] == pd.Timestamp("2024-03-08 22:00:00")]
+    passed &= check("weekend gap Fri 22:00 -> Sun 22:45",
+                    len(weekend) == 1 and weekend[0]['end'] == pd.Timestamp("2024-03-10 22:45:00")
+                    and weekend[0]['duration_minutes'] == 49 * 60)
+
+    # Mon-Thu nights over two weeks; the 2024-03-12 break is longer because of the missing 23:00 candle
+    daily_breaks = [gap for gap in found if gap['start'].hour == 22 and gap['duration_minutes'] == 60]
+    passed &= check("daily session breaks detected", len(daily_breaks) == 7)
+
+    merged_break = [gap for gap in found if gap['start'] == pd.Timestamp("2024-03-12 22:00:00")]
+    passed &= check("missing candle after a daily break extends that gap",
+                    len(merged_break) == 1 and merged_break[0]['end'] == pd.Timestamp("2024-03-12 23:00:00"))
+
+    no_gaps = make_session_timestamps("2024-03-04 00:00:00", "2024-03-04 21:45:00").as_unit("ns").asi8
+    passed &= check("no gaps on continuous data", all(arr.size == 0 for arr in _find_gaps(no_gaps, expected_ns)))
+    passed &= check("single candle has no gaps", all(arr.size == 0 for arr in _find_gaps(no_gaps[:1], expected_ns)))
+
+    return passed, found
+
+def test_coalesce_gaps(gaps):
+    """Merged gaps must cover every original gap, and only merge gaps within merge_intervals candles"""
+    crawler = make_crawler()
+    original = [dict(gap) for gap in gaps]
+    passed = True
+
+    for merge_intervals in [0, 1, 2, 8, 96]:
+        merged = crawler._coalesce_gaps(list(reversed(gaps)), merge_intervals=merge_intervals)
+        max_distance = timedelta(minutes=TIMEFRAME_MINUTES * merge_intervals)
+
+        covered = all(any(m['start'] <= gap['start'] and gap['end'] <= m['end'] for m in merged) for gap in gaps)
+        separated = all(later['start'] - earlier['end'] > max_distance
+                        for earlier, later in zip(merged[:-1], merged[1:]))
+        durations = sum(m['duration_minutes'] for m in merged) == sum(gap['duration_minutes'] for gap in gaps)
+
+        print(f"merge_intervals={merge_intervals}: {len(gaps)} gaps -> {len(merged)} requests")
+        passed &= check("  covers all gaps", covered)
+        passed &= check(f"  merged ranges are further apart than {merge_intervals} candles", separated)
+        passed &= check("  missing minutes preserved", durations)
+
+    # Two single missing candles 30 minutes apart (one candle between them)
+    pair = [gap for gap in gaps if gap['start'].date() == pd.Timestamp("2024-03-05").date() and gap['start'].hour == 10]
+    passed &= check("nearby candles stay separate at merge_intervals=1",
+                    len(crawler._coalesce_gaps(pair, merge_intervals=1)) == 2)
+    passed &= check("nearby candles merge at merge_intervals=2",
+                    len(crawler._coalesce_gaps(pair, merge_intervals=2)) == 1)
+
+    # Default setting: a daily break plus the following weekday's breaks are all within 96 candles (24h)
+    passed &= check("default merge collapses the whole series", len(crawler._coalesce_gaps(gaps)) == 1)
+    passed &= check("input gaps are not modified", gaps == original)
+    passed &= check("empty input", crawler._coalesce_gaps([]) == [])
+
+    return passed
+
+def main():
+    print("="*60)
+    print("GAP DETECTION")
+    print("="*60)
+    passed, gaps = test_find_gaps()
+
+    print("\n" + "="*60)
+    print("GAP COALESCING")
+    print("="*60)
+    passed &= test_coalesce_gaps(gaps)
+
+    print("="*60)
+    print("ALL PASSED" if passed else "FAILED")
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
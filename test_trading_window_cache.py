@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test the trading-minutes mask (utils.build_trading_minutes_mask) and the backtest candle cache
+
+The mask must agree with is_within_trading_hours for every minute of the day. The NPZ cache
+(Backtester._load_candles_cached) is exercised on a temporary SQLite database and cache directory.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from testing_utils import use_temp_database, make_candles, check
+
+TEST_DIR = use_temp_database('test_cache.db', ENABLE_CANDLE_CACHE='true')
+os.environ['CANDLE_CACHE_DIR'] = os.path.join(TEST_DIR, 'cache')
+
+import numpy as np
+from sqlalchemy import text
+from backtester import Backtester, CACHE_PRICE_COLUMNS
+from config import CANDLE_CACHE_DIR
+from utils import build_trading_minutes_mask, is_within_trading_hours
+from logger import setup_logger
+
+logger = setup_logger()
+
+TRADING_WINDOWS = [
+    ("16:00", "23:00"),  # default TRADE_START_TIME/TRADE_END_TIME
+    ("00:00", "23:59"),
+    ("09:30", "09:30"),  # single minute
+    ("23:00", "02:00"),  # crosses midnight
+    ("22:15", "00:00"),
+    ("00:00", "00:00"),
+    ("bad", "23:00"),    # unparsable -> allow every minute
+    ("16:00", ""),
+]
+
+def test_trading_minutes_mask():
+    """mask[hour * 60 + minute] must equal is_within_trading_hours for all 1440 minutes"""
+    day = datetime(2024, 3, 4)
+    minutes = [day + timedelta(minutes=i) for i in range(1440)]
+
+    passed = True
+    for start, end in TRADING_WINDOWS:
+        mask = build_trading_minutes_mask(start, end)
+        expected = np.array([is_within_trading_hours(ts, start, end) for ts in minutes])
+        mismatches = np.flatnonzero(mask != expected)
+        passed &= check(f"{start!r}-{end!r}: {int(mask.sum())} trading minutes", mask.shape == (1440,) and mismatches.size == 0)
+        if mismatches.size:
+            print(f"  first mismatches at minute {mismatches[:5].tolist()}")
+
+    return passed
+
+def cache_files():
+    return sorted(os.listdir(CANDLE_CACHE_DIR)) if os.path.isdir(CANDLE_CACHE_DIR) else []
+
+def same_candles(left, right):
+    columns = ['timestamp'] + CACHE_PRICE_COLUMNS
+    left = left[columns].astype({'timestamp': 'datetime64[ns]', 'volume': 'float64'}).reset_index(drop=True)
+    right = right[columns].astype({'timestamp': 'datetime64[ns]', 'volume': 'float64'}).reset_index(drop=True)
+    return left.equals(right)
+
+def test_candle_cache():
+    """Cache round-trip, hit without touching the DB, and the ways a cached range is invalidated"""
+    backtester = Backtester(timeframe='15m')
+    db = backtester.db
+    db.save_candles(make_candles("2024-03-04", 500, seed=11), '15m')
+
+    start_dt = datetime(2024, 3, 4)
+    end_dt = datetime(2024, 3, 6, 23, 59, 59)
+    passed = True
+
+    from_db = db.load_candles(start_dt, end_dt, '15m')
+    first = backtester._load_candles_cached(start_dt, end_dt, '15m')
+    files = cache_files()
+    passed &= check("first load writes one cache file", len(files) == 1)
+    passed &= check("first load matches the database", same_candles(first, from_db))
+
+    # Remove the rows from the DB: a cache hit must still return them
+    with db.engine.begin() as conn:
+        conn.execute(text("DELETE FROM candles WHERE timestamp >= :start"), {"start": "2024-03-06 00:00:00"})
+    cached = backtester._load_candles_cached(start_dt, end_dt, '15m')
+    passed &= check("round-trip from cache keeps timestamps and OHLCV", same_candles(cached, from_db))
+    passed &= check("cached volume is usable as a number", np.issubdtype(cached['volume'].dtype, np.number))
+
+    # A different range is a different cache key
+    shorter_end = datetime(2024, 3, 6, 23, 0, 0)
+    shorter = backtester._load_candles_cached(start_dt, shorter_end, '15m')
+    passed &= check("different range misses the cache", len(cache_files()) == 2 and
+                    same_candles(shorter, db.load_candles(start_dt, shorter_end, '15m')))
+
+    # Deleting the file invalidates it: the next load reflects the database again
+    cache_path = os.path.join(CANDLE_CACHE_DIR, files[0])
+    os.remove(cache_path)
+    reloaded = backtester._load_candles_cached(start_dt, end_dt, '15m')
+    passed &= check("deleted cache file reloads from the database",
+                    same_candles(reloaded, db.load_candles(start_dt, end_dt, '15m')) and len(reloaded) < len(from_db))
+
+    # A corrupt file is ignored and rewritten
+    with open(cache_path, 'wb') as f:
+        f.write(b'not an npz file')
+    recovered = backtester._load_candles_cached(start_dt, end_dt, '15m')
+    passed &= check("corrupt cache file falls back to the database", same_candles(recovered, reloaded))
+    with np.load(cache_path) as rewritten:
+        passed &= check("corrupt cache file is rewritten", len(rewritten['timestamp']) == len(reloaded))
+
+    # A truncated real cache file (e.g. an interrupted write) still starts with the zip magic
+    with open(cache_path, 'rb') as f:
+        data = f.read()
+    with open(cache_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    recovered = backtester._load_candles_cached(start_dt, end_dt, '15m')
+    passed &= check("truncated cache file falls back to the database", same_candles(recovered, reloaded))
+    with np.load(cache_path) as rewritten:
+        passed &= check("truncated cache file is rewritten", len(rewritten['timestamp']) == len(reloaded))
+    passed &= check("no temp files left in the cache directory",
+                    not any(name.endswith('.tmp') for name in cache_files()))
+
+    # Empty results are not cached
+    empty = backtester._load_candles_cached(datetime(2020, 1, 1), datetime(2020, 1, 2), '15m')
+    passed &= check("empty range is not cached", empty.empty and len(cache_files()) == 2)
+
+    backtester.close()
+    return passed
+
+def main():
+    print("="*60)
+    print("TRADING MINUTES MASK")
+    print("="*60)
+    passed = test_trading_minutes_mask()
+
+    print("\n" + "="*60)
+    print("CANDLE CACHE")
+    print("="*60)
+    try:
+        passed &= test_candle_cache()
+    except Exception as e:
+        logger.error(f"Candle cache test failed: {e}")
+        passed = False
+
+    print("="*60)
+    print("ALL PASSED" if passed else "FAILED")
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
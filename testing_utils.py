@@ -0,0 +1,69 @@
+"""
+Shared setup and helpers for the test_*.py scripts
+
+Scripts that need a database call use_temp_database() before importing config (directly or through
+models, backtester, ...), since DATABASE_URL is read once at import.
+"""
+
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Set in the environment so spawned worker processes, which re-import the test script, reuse the same directory
+TEST_DIR_ENV = 'XAU_TEST_DIR'
+
+# SQLite has no adapter for pandas Timestamps (PostgreSQL/psycopg2 handles them natively)
+sqlite3.register_adapter(pd.Timestamp, lambda ts: ts.strftime('%Y-%m-%d %H:%M:%S'))
+
+def use_temp_database(db_name='test.db', **env):
+    """
+    Point DATABASE_URL at a SQLite file in a temporary directory
+
+    Args:
+        db_name: SQLite file name inside the temporary directory
+        **env: Extra environment settings read by config (e.g. ENABLE_CANDLE_CACHE='false')
+
+    Returns:
+        str: The temporary directory
+    """
+    if TEST_DIR_ENV not in os.environ:
+        os.environ[TEST_DIR_ENV] = tempfile.mkdtemp()
+    test_dir = os.environ[TEST_DIR_ENV]
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(test_dir, db_name)}"
+    os.environ.update(env)
+    return test_dir
+
+def make_candles(start, periods, freq='15min', seed=7, decimals=5):
+    """
+    Build random-walk OHLCV candles
+
+    Args:
+        start: First candle time
+        periods: Number of candles
+        freq: Candle spacing (pandas frequency string)
+        seed: Random seed
+        decimals: Price rounding
+
+    Returns:
+        DataFrame: timestamp, open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    close = 2300 + np.cumsum(rng.normal(0, 1, periods))
+    open_ = close + rng.normal(0, 0.3, periods)
+    spread = np.abs(rng.normal(0, 0.5, periods))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=periods, freq=freq),
+        'open': np.round(open_, decimals),
+        'high': np.round(np.maximum(open_, close) + spread, decimals),
+        'low': np.round(np.minimum(open_, close) - spread, decimals),
+        'close': np.round(close, decimals),
+        'volume': rng.integers(1, 1000, periods)
+    })
+
+def check(name, passed):
+    """Print a PASS/FAIL line and return the result"""
+    print(f"{name}: {'PASS' if passed else 'FAIL'}")
+    return passed
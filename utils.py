@@ -1,8 +1,20 @@
 from datetime import datetime, timedelta, timezone
+import numpy as np
 import pandas as pd
 import os
 from config import TP_AMOUNT, SL_AMOUNT, STRONG_SIGNAL_TP, STRONG_SIGNAL_SL_BUFFER
 
+# Supported timeframe strings and their duration in minutes
+TIMEFRAME_MINUTES = {
+    '1m': 1,
+    '5m': 5,
+    '15m': 15,
+    '30m': 30,
+    '1h': 60,
+    '4h': 240,
+    '1d': 1440
+}
+
 def is_green_candle(candle):
     """Check if candle is green (close > open)"""
     return candle['close'] > candle['open']
@@ -235,6 +247,44 @@ def is_within_trading_hours(timestamp, start_time_str, end_time_str):
         # If there's an error parsing time, default to allowing trade
         return True
 
+def build_trading_minutes_mask(start_time_str, end_time_str):
+    """
+    Build a minute-of-day lookup table for the trading window
+    
+    Equivalent to is_within_trading_hours() for every minute of the day, so per-candle
+    checks become a single array lookup: mask[hour * 60 + minute].
+    
+    Args:
+        start_time_str: str - Start time in HH:MM format
+        end_time_str: str - End time in HH:MM format
+    
+    Returns:
+        np.ndarray: 1440 booleans, True for minutes inside the trading window
+    """
+    mask = np.zeros(1440, dtype=bool)
+    
+    try:
+        start_hour, start_min = map(int, start_time_str.split(':'))
+        end_hour, end_min = map(int, end_time_str.split(':'))
+    except (ValueError, AttributeError):
+        # If there's an error parsing time, default to allowing trade
+        mask[:] = True
+        return mask
+    
+    start_minutes = max(start_hour * 60 + start_min, 0)
+    end_minutes = end_hour * 60 + end_min
+    
+    if end_minutes < start_minutes:
+        # Window crosses midnight (e.g., 23:00 to 02:00)
+        mask[start_minutes:] = True
+        if end_minutes >= 0:
+            mask[:end_minutes + 1] = True
+    else:
+        # Normal window, end time inclusive
+        mask[start_minutes:end_minutes + 1] = True
+    
+    return mask
+
 def format_datetime(dt):
     """Format datetime to string"""
     if isinstance(dt, str):